@@ -4,6 +4,9 @@
     - 'Resistor.series' - Returns the sum of two resistors in series
     - 'Resistor.parallel - Returns the sum of two rsistors in parallel
 
+    Both take any number of values, one iterable or array, or a 2-D batch with one network per row,
+    and sum with math.fsum accuracy, rounding only when decimals is given
+
     Examples:
     >>> Resistor.parallel(200,200)
     100.0
@@ -13,41 +16,107 @@
 
 
 """
-from typing import Union
+import math
+
+import numpy as np
+
+SHORT_POLICIES = ('zero', 'raise', 'skip')
+
+
+def _values(resistors) -> np.ndarray:
+    """ one argument that is a list, iterator or array of values, or the values themselves, as a float array """
+    if len(resistors) == 1 and np.ndim(resistors[0]) == 0 and not hasattr(resistors[0], '__next__'):
+        return np.asarray(resistors, dtype=float)
+    values = resistors[0] if len(resistors) == 1 else resistors
+    if not isinstance(values, (np.ndarray, list, tuple)):
+        values = list(values)
+    return np.asarray(values, dtype=float)
+
+
+def _fsum(values: np.ndarray, axis: int):
+    """
+    Sum along axis, correctly rounded (math.fsum) for one network, Neumaier compensated for a batch,
+    one vectorized step per part so the error stays at a rounding or two whatever the order
+    """
+    if values.ndim == 1:
+        return math.fsum(values.tolist())
+    parts = np.ascontiguousarray(np.moveaxis(values, axis, 0))
+    total = np.zeros(parts.shape[1:])
+    compensation = np.zeros(parts.shape[1:])
+    for x in parts:
+        t = total + x
+        compensation += np.where(np.abs(total) >= np.abs(x), (total - t) + x, (x - t) + total)
+        total = t
+    return total + compensation
+
+
+def _shorts(values, short):
+    if short not in SHORT_POLICIES:
+        raise ValueError(f'short must be one of {SHORT_POLICIES}, got {short!r}')
+    shorted = values == 0
+    if short == 'raise' and shorted.any():
+        raise ValueError(f'{np.count_nonzero(shorted)} zero ohm resistor(s), a short circuit')
+    return shorted
+
+
+def _round(total, decimals):
+    if decimals is None:
+        return total
+    return round(float(total), decimals) if np.ndim(total) == 0 else np.round(total, decimals)
 
 
 class Resistor:
     @staticmethod
-    def series(resistors: list[float | int]) -> float:
+    def series(*resistors, axis: int = -1, decimals: [int | None] = None, short: str = 'zero'):
         """ Rt = resistor1 + resistor2 + resistorN
         Examples:
         >>> Resistor.series([200,200])
         400.0
+        >>> Resistor.series(0.1, 0.2, 0.3), sum([0.1, 0.2, 0.3])
+        (0.6, 0.6000000000000001)
+        >>> Resistor.series([[100, 200], [33, 68]]).tolist()
+        [300.0, 101.0]
 
-        resistor1: A number in ohms representing the first resistor
-        resistor2 A number in ohms representing the second resisitor
+        resistors: values in ohms, as separate arguments, one list, iterator or array,
+            or a 2-D batch with one network per row (along axis)
+        decimals: rounds the result when given, nothing is rounded by default
+        short: 'zero' and 'skip' add a zero ohm resistor like any other, 'raise' raises ValueError
         Returns:
-             Rt:float with the sum (Rt) of resitor1 and resistor2 in ohms
+             Rt:float with the sum (Rt) of the resistors in ohms, an array of them for a batch
         """
-        total = 0
-        [total := total + r for r in resistors]
-        return round(float(total), 2)
+        values = _values(resistors)
+        _shorts(values, short)
+        return _round(_fsum(values, axis), decimals)
 
     @staticmethod
-    def parallel(r1: Union[float, int], r2: Union[float, int]) -> float:
-        """Compute the sum of two parallel resistors
+    def parallel(*resistors, axis: int = -1, decimals: [int | None] = None, short: str = 'zero'):
+        """Compute the total of any number of resistors in parallel, 1/Rt = 1/R1 + 1/R2 + ...
         Examples:
         >>> Resistor.parallel(100,100)
         50.0
-        >>> Resistor.parallel(200,100)
+        >>> Resistor.parallel(200,100, decimals=2)
         66.67
+        >>> Resistor.parallel(np.array([[100, 100, 0], [300, 300, 300]]), decimals=2).tolist()
+        [0.0, 100.0]
+        >>> Resistor.parallel([[100, 100, 0], [300, 300, 0]], short='skip').tolist()
+        [50.0, 150.0]
 
-        resistor1: first resistor's value in ohms
-        resistor2: second resistor's value in ohms
+        resistors: values in ohms, as separate arguments, one list, iterator or array,
+            or a 2-D batch with one network per row (along axis)
+        decimals: rounds the result when given, nothing is rounded by default
+        short: what a zero ohm resistor does, 'zero' shorts its network to 0 ohms, 'raise' raises ValueError,
+            'skip' leaves it out (padding of ragged batches), a network with nothing left is open (inf)
         Returns:
-            The computed sum of two resistors in parallel
+            The computed total of the resistors in parallel, an array of them for a batch
         """
-        return round(float(((r1 ** -1) + (r2 ** -1)) ** -1), 2)
+        values = _values(resistors)
+        shorted = _shorts(values, short)
+        with np.errstate(divide='ignore'):
+            reciprocal = np.where(shorted, 0.0, 1 / np.where(shorted, 1.0, values))
+            total = 1 / np.asarray(_fsum(reciprocal, axis))
+        if short == 'zero':
+            total = np.where(shorted.any(axis=axis), 0.0, total)
+        return _round(total if total.ndim else float(total), decimals)
 
 # print(Resistor.parallel(100, 100), chr(937))
 # print(Resistor.parallel(200, 100), chr(937))
@@ -0,0 +1,253 @@
+# Chapter-6/benchmarks.py
+
+"""
+# - Timing comparisons for the circuit classes in resistor.py
+# - run with python benchmarks.py from the Chapter-6 directory
+
+"""
+import importlib
+import math
+import time
+import traceback
+
+import numpy as np
+
+import exact
+from eseries import ESeriesIndex
+from nodal import Netlist
+import resistor
+from resistor import Resistor, Series, Parallel
+
+helpers = importlib.import_module('6-6').Resistor  # 6-6.py is not an identifier
+
+SIZES = (10 ** 3, 10 ** 5, 10 ** 6)
+SCALAR_LIMIT = 10 ** 4  # per-object loops are timed on at most this many networks and scaled up
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+class _StackInspectingResistor(Resistor):
+    """ Resistor constructed the way it was before the name= argument, walking the stack every time """
+
+    def __init__(self, ohms):
+        super().__init__(ohms, name='')
+        (filename, line_number, function_name, text) = traceback.extract_stack()[-2]
+        self._def_name = text[:text.find('=')].strip()
+
+
+def _series_objects(rows, volts):
+    for row, vs in zip(rows, volts):
+        s = Series([Resistor(r) for r in row], vs)
+        s.rt, s.it, s.voltage_drops
+
+
+def _parallel_objects(rows):
+    for row in rows:
+        Parallel([Resistor(r) for r in row]).rt()
+
+
+def bench_series_parallel_batch(sizes=SIZES, width=5, seed=0):
+    """
+    Prints per-object versus batch time for series and parallel networks of width resistors
+    """
+    rng = np.random.default_rng(seed)
+    for n in sizes:
+        ohms = rng.uniform(10, 10e3, size=(n, width)).round()
+        volts = rng.uniform(1, 50, size=n).round(1)
+        m = min(n, SCALAR_LIMIT)
+        rows, vs = ohms[:m].tolist(), volts[:m].tolist()
+
+        series_objects = _timed(_series_objects, rows, vs) * n / m
+        series_batch = _timed(Series.batch, ohms, volts)
+        parallel_objects = _timed(_parallel_objects, rows) * n / m
+        parallel_batch = _timed(Parallel.batch, ohms, volts)
+        print(f'n={n:>9,} series   objects={series_objects:9.3f}s batch={series_batch:8.4f}s '
+              f'speedup={series_objects / series_batch:8.0f}x')
+        print(f'n={n:>9,} parallel objects={parallel_objects:9.3f}s batch={parallel_batch:8.4f}s '
+              f'speedup={parallel_objects / parallel_batch:8.0f}x')
+
+
+def _listcomp_series(resistors):
+    """ Resistor.series of 6-6.py as it was, a list comprehension sum rounded to 2 decimals """
+    total = 0
+    [total := total + r for r in resistors]
+    return round(float(total), 2)
+
+
+def bench_static_helpers(rows=10 ** 6, width=8, seed=0):
+    """
+    Prints the time of the 6-6.py series and parallel helpers on a (rows x width) batch against a Python loop
+    over the rows (timed on SCALAR_LIMIT rows and scaled up), and the worst error of each against math.fsum
+    """
+    ohms = np.random.default_rng(seed).uniform(1, 1e6, size=(rows, width))
+    m = min(rows, SCALAR_LIMIT)
+    loop = _timed(lambda: [_listcomp_series(row) for row in ohms[:m].tolist()]) * rows / m
+    batch_series = _timed(helpers.series, ohms)
+    batch_parallel = _timed(helpers.parallel, ohms)
+    exact = np.array([math.fsum(row) for row in ohms[:m].tolist()])
+    compensated = np.abs(helpers.series(ohms[:m]) - exact).max()
+    pairwise = np.abs(ohms[:m].sum(axis=1) - exact).max()
+    print(f'6-6 helpers {rows:,} x {width} loop series={loop:.3f}s batch series={batch_series:.3f}s '
+          f'parallel={batch_parallel:.3f}s max error vs fsum: compensated={compensated:.1e} np.sum={pairwise:.1e}')
+
+
+def bench_parallel_branches(banks=10 ** 5, width=8, volts=12.0, seed=0):
+    """
+    Prints the time for branch currents and power of banks parallel banks with Resistor.current()
+    and power() per branch (timed on SCALAR_LIMIT banks and scaled up) against Parallel.branches
+    """
+    ohms = np.random.default_rng(seed).uniform(10, 10e3, size=(banks, width))
+    m = min(banks, SCALAR_LIMIT)
+    networks = [Parallel([Resistor(r, name='R') for r in row], volts, name='P') for row in ohms[:m].tolist()]
+    per_branch = _timed(lambda: [([r.current(volts) for r in p.resistors], [r.power(volts) for r in p.resistors])
+                                 for p in networks]) * banks / m
+    batch = _timed(Parallel.branches, ohms, volts)
+    print(f'parallel branches {banks:,} banks x {width} Resistor.current/power={per_branch:.3f}s '
+          f'Parallel.branches={batch:.4f}s')
+
+
+def bench_construction(n=10 ** 5):
+    """
+    Prints the cost of building n resistors with stack inspection, lazy symbols and explicit names
+    """
+    values = [float(v) for v in range(1, n + 1)]
+    stack = _timed(lambda: [_StackInspectingResistor(v) for v in values])
+    lazy = _timed(lambda: [Resistor(v) for v in values])
+    named = _timed(lambda: [Resistor(v, name='R') for v in values])
+    lazy_symbols = _timed(lambda rs: [r.symbol for r in rs], [Resistor(v) for v in values])
+    print(f'n={n:,} extract_stack={stack:.3f}s lazy={lazy:.3f}s named={named:.3f}s '
+          f'speedup={stack / lazy:.0f}x/{stack / named:.0f}x, resolving every lazy symbol={lazy_symbols:.3f}s')
+
+
+def grid_netlist(n, ohms=1.0, volts=1.0):
+    """ n x n resistor mesh, node 0 is the grounded corner and the opposite corner is driven by volts """
+    nodes = np.arange(n * n).reshape(n, n)
+    a = np.concatenate([nodes[:, :-1].ravel(), nodes[:-1, :].ravel()])
+    b = np.concatenate([nodes[:, 1:].ravel(), nodes[1:, :].ravel()])
+    netlist = Netlist()
+    netlist.add_many(np.full(len(a), ohms), a, b)
+    netlist.voltage_source(volts, n * n - 1)
+    return netlist
+
+
+def bench_nodal_grid(sizes=(100, 200, 400, 800), methods=('direct', 'cg')):
+    """
+    Prints build and solve time for n x n grids, time per node should stay roughly flat
+    """
+    for n in sizes:
+        start = time.perf_counter()
+        netlist = grid_netlist(n)
+        build = time.perf_counter() - start
+        for method in methods:
+            solve = _timed(netlist.solve, method)
+            print(f'{n}x{n} grid {n * n:>9,} nodes build={build:6.3f}s {method:6} solve={solve:7.3f}s '
+                  f'{solve / (n * n) * 1e6:6.2f}\u03BCs/node')
+
+
+def bench_thevenin_sweep(n=200, loads=10 ** 5, resolve_limit=10):
+    """
+    Prints the time to sweep loads load resistors across the middle of an n x n grid through its Thevenin
+    equivalent, against adding each load to the netlist and solving it again (timed on resolve_limit loads)
+    """
+    terminal = n * n // 2
+    values = np.geomspace(1e-2, 1e4, loads)
+    netlist = grid_netlist(n)
+    start = time.perf_counter()
+    equivalent = netlist.thevenin(terminal)
+    extract = time.perf_counter() - start
+    sweep = _timed(equivalent.load, values)
+    m = min(loads, resolve_limit)
+    start = time.perf_counter()
+    for ohms in values[:m]:
+        loaded = grid_netlist(n)
+        loaded.add(ohms, terminal, 0)
+        loaded.solve()
+    resolve = (time.perf_counter() - start) * loads / m
+    print(f'thevenin {n}x{n} grid {loads:,} loads extract={extract:.3f}s sweep={sweep:.4f}s '
+          f're-solve every load={resolve:.1f}s')
+
+
+def bench_eseries(n=10 ** 5, series=('E24', 'E96'), seed=0):
+    """
+    Prints the time for n nearest value and best 2 and 3 part combination queries
+    """
+    targets = np.random.default_rng(seed).uniform(1, 1e6, size=n)
+    for name in series:
+        index = ESeriesIndex(name)
+        m = min(n, SCALAR_LIMIT)
+        bisect = _timed(lambda: [index.nearest(t) for t in targets[:m].tolist()]) * n / m
+        nearest = _timed(index.nearest_many, targets)
+        pairs = _timed(index.best, targets, 2)
+        triples = _timed(index.best, targets, 3)
+        print(f'{name} ({len(index.values)} values) n={n:,} nearest bisect={bisect:.3f}s vectorized={nearest:.3f}s '
+              f'best of 2={pairs:.3f}s best of 3={triples:.3f}s')
+
+
+def _uncached_voltage_drops(s):
+    """ Series.voltage_drops as it was before the cache, rt summed again for every resistor """
+    def rt():
+        total = 0
+        [total := total + r.ohms for r in s.resistors]
+        return total
+    return {f'{r.symbol.upper()}={r.ohms}\u03A9': round((r.ohms / rt()) * s.volts, 2) for r in s.resistors}
+
+
+def bench_series_cache(widths=(10, 100, 1000), repeats=10):
+    """
+    Prints the time of rt, it and voltage_drops on one Series read repeats times, uncached against cached,
+    and the hit rate of the process wide cache
+    """
+    for width in widths:
+        parts = [Resistor(r, name=f'R{r}') for r in range(1, width + 1)]
+        s = Series(parts, 10, name='S')
+        uncached = _timed(lambda: [_uncached_voltage_drops(s) for _ in range(repeats)])
+        resistor.cache_clear()
+        cached = _timed(lambda: [(s.rt, s.it, s.voltage_drops) for _ in range(repeats)])
+        print(f'series width={width:5} x{repeats} uncached={uncached:.4f}s cached={cached:.4f}s '
+              f'{resistor.cache_info()}')
+
+
+def _rounded_ladder(series_ohms, shunt_ohms):
+    """ ladder reduced the way Parallel.rt() does it, rounded to 2 decimals at every rung """
+    end = None
+    for r, shunt in zip(reversed(series_ohms), reversed(shunt_ohms)):
+        end = r + (shunt if end is None else round((shunt ** -1 + end ** -1) ** -1, 2))
+    return end
+
+
+def bench_exact_ladder(depths=(10, 100, 1000), seed=0):
+    """
+    Prints the time of the exact (Fraction) and float backends reducing an E24 ladder of depth rungs,
+    and how far the float and rounded at every step results land from the exact value
+    """
+    index = ESeriesIndex('E24', decades=range(2, 5))
+    rng = np.random.default_rng(seed)
+    for depth in depths:
+        series_ohms = rng.choice(index.values, depth).tolist()
+        shunt_ohms = rng.choice(index.values, depth).tolist()
+        start = time.perf_counter()
+        fraction = exact.ladder(series_ohms, shunt_ohms)
+        exact_time = time.perf_counter() - start
+        start = time.perf_counter()
+        fast = exact.ladder(series_ohms, shunt_ohms, backend='float')
+        float_time = time.perf_counter() - start
+        rounded = _rounded_ladder(series_ohms, shunt_ohms)
+        print(f'ladder depth={depth:5} exact={exact_time:.4f}s float={float_time:.6f}s '
+              f'denominator digits={len(str(fraction.denominator)):6} '
+              f'float error={abs(fast - fraction) / fraction:.1e} rounded error={abs(rounded - fraction) / fraction:.1e}')
+
+
+if __name__ == '__main__':
+    bench_series_parallel_batch()
+    bench_static_helpers()
+    bench_parallel_branches()
+    bench_construction()
+    bench_series_cache()
+    bench_exact_ladder()
+    bench_nodal_grid()
+    bench_thevenin_sweep()
+    bench_eseries()
@@ -0,0 +1,184 @@
+# Chapter-6/eseries.py
+
+"""
+# - IEC 60063 E-series standard values (E6 to E192) as a sorted index over several decades
+# - nearest standard value by bisection and best 2 or 3 part series/parallel combinations
+#   found through a sorted index of every pair instead of enumerating every triple
+
+"""
+from bisect import bisect_left
+from typing import NamedTuple
+
+import numpy as np
+
+E24 = (1.0, 1.1, 1.2, 1.3, 1.5, 1.6, 1.8, 2.0, 2.2, 2.4, 2.7, 3.0,
+       3.3, 3.6, 3.9, 4.3, 4.7, 5.1, 5.6, 6.2, 6.8, 7.5, 8.2, 9.1)
+E12 = E24[::2]
+E6 = E24[::4]
+# E192 follows 10 ** (n / 192) rounded to 3 figures except for 9.20, E96 and E48 are every 2nd and 4th value
+E192 = tuple(9.20 if n == 185 else round(10 ** (n / 192), 2) for n in range(192))
+E96 = E192[::2]
+E48 = E192[::4]
+SERIES = {'E6': E6, 'E12': E12, 'E24': E24, 'E48': E48, 'E96': E96, 'E192': E192}
+
+# how each combination is wired, filled with the part values in order
+TOPOLOGIES = ('{0}', '{0} + {1}', '{0} || {1}', '{0} + {1} + {2}', '{0} + ({1} || {2})',
+              '{0} || {1} || {2}', '{0} || ({1} + {2})')
+SINGLE, SERIES2, PARALLEL2, SERIES3, SERIES_PARALLEL, PARALLEL3, PARALLEL_SERIES = range(len(TOPOLOGIES))
+
+
+class Combination(NamedTuple):
+    value: float
+    error: float  # relative, (value - target) / target
+    topology: int
+    parts: tuple
+
+    def __str__(self):
+        return f'{TOPOLOGIES[self.topology].format(*self.parts)} = {self.value:,.6g} ({self.error:+.3%})'
+
+
+def _neighbours(index, needles, width):
+    """ positions of the width entries either side of each needle in a sorted array """
+    pos = np.searchsorted(index, needles)
+    return np.clip(pos[..., np.newaxis] + np.arange(-width, width), 0, len(index) - 1)
+
+
+class ESeriesIndex:
+    """
+    Standard values of one E-series over a range of decades, e.g. decades=range(0, 7) for 1Ω to 9.1MΩ
+    or decades=range(-12, -3) for 1pF to 910μF
+    Examples:
+        >>> e24 = ESeriesIndex('E24')
+        >>> e24.nearest(4600)
+        4700.0
+        >>> e24.nearest_many([4600, 12.4, 1e9]).tolist()
+        [4700.0, 12.0, 9100000.0]
+        >>> print(e24.combinations(4600, parts=2, k=1)[0])
+        1000.0 + 3600.0 = 4,600 (+0.000%)
+        >>> e24.best([4600, 1234], parts=3).round(1).tolist()
+        [4600.0, 1234.0]
+        >>> ESeriesIndex('E96').nearest(10.3)
+        10.2
+    """
+
+    def __init__(self, series: str = 'E24', decades=range(0, 7)):
+        if series not in SERIES:
+            raise ValueError(f'unsupported series: {series}, expected one of {", ".join(SERIES)}')
+        self.series = series
+        # rounded to 3 significant figures so 4.7 * 1e3 is stored as 4700.0 and not 4700.000000000001
+        self.values = np.array(sorted(float(f'{m * 10.0 ** d:.3g}') for d in decades for m in SERIES[series]))
+        self._sorted = self.values.tolist()
+        self._pairs = None
+
+    def nearest(self, target: [int | float]) -> float:
+        """ standard value with the smallest relative error to target """
+        i = bisect_left(self._sorted, target)
+        candidates = self._sorted[max(i - 1, 0):i + 1]
+        return min(candidates, key=lambda v: abs(v - target) / target)
+
+    def nearest_many(self, targets) -> np.ndarray:
+        """ nearest() for an array of targets in one vectorized pass """
+        targets = np.asarray(targets, dtype=float)
+        pos = _neighbours(self.values, targets, 1)
+        candidates = self.values[pos]
+        best = np.abs(candidates / targets[..., np.newaxis] - 1).argmin(axis=-1)
+        return np.take_along_axis(candidates, best[..., np.newaxis], axis=-1)[..., 0]
+
+    def at_least(self, targets) -> np.ndarray:
+        """ smallest standard value >= each target, nan above the largest value of the index
+        Examples:
+            >>> ESeriesIndex('E12', decades=range(-6, -3)).at_least([4.2e-3, 4.7e-6]).tolist()
+            [nan, 4.7e-06]
+            >>> ESeriesIndex('E12').at_least([4800, 4700.0]).tolist()
+            [5600.0, 4700.0]
+        """
+        targets = np.asarray(targets, dtype=float)
+        # a relative tolerance so a target computed as 4.7e-6 * (1 + 1e-16) still maps to 4.7e-6
+        pos = np.searchsorted(self.values, targets * (1 - 1e-12))
+        padded = np.append(self.values, np.nan)
+        return padded[pos]
+
+    def _pair_index(self):
+        """ every pair i <= j of standard values combined in series and in parallel, each sorted by value """
+        if self._pairs is None:
+            i, j = np.triu_indices(len(self.values))
+            a, b = self.values[i], self.values[j]
+            series, parallel = a + b, a * b / (a + b)
+            s, p = series.argsort(), parallel.argsort()
+            self._pairs = (series[s], i[s], j[s]), (parallel[p], i[p], j[p])
+        return self._pairs
+
+    def _candidates(self, targets, parts, width, with_parts=True):
+        """ (values, topologies, part indices) of every candidate near each target, one row per target,
+        topologies and part indices are None when with_parts is False """
+        v = self.values
+        q = len(targets)
+        (s_val, s_i, s_j), (p_val, p_i, p_j) = self._pair_index()
+        t = targets[:, np.newaxis]
+        values, topologies, indices = [], [], []
+
+        def add(value, topology, *parts_index):
+            """ parts_index arrays have the shape of value, unused part slots are -1 """
+            values.append(value.reshape(q, -1))
+            if not with_parts:
+                return
+            topologies.append(np.full(values[-1].shape, topology, dtype=np.int8))
+            parts_index += (np.full(value.shape, -1),) * (3 - len(parts_index))
+            indices.append(np.stack([np.broadcast_to(x, value.shape).reshape(q, -1) for x in parts_index], axis=-1))
+
+        pos = _neighbours(v, t, width)
+        add(v[pos], SINGLE, pos)
+        if parts >= 2:
+            pos = _neighbours(s_val, t, width)
+            add(s_val[pos], SERIES2, s_i[pos], s_j[pos])
+            pos = _neighbours(p_val, t, width)
+            add(p_val[pos], PARALLEL2, p_i[pos], p_j[pos])
+        if parts >= 3:
+            c = np.arange(len(v))[np.newaxis, :]
+            rest = t - v[c]  # the pair that has to go in series with part c
+            with np.errstate(divide='ignore'):
+                # the pair that has to go in parallel with part c, infinite when c alone is already too small
+                shunt = np.where(v[c] > t, 1 / (1 / t - 1 / v[c]), np.inf)
+            c = c[..., np.newaxis]
+            pos = _neighbours(s_val, rest, width)
+            add(v[c] + s_val[pos], SERIES3, c, s_i[pos], s_j[pos])
+            pos = _neighbours(p_val, rest, width)
+            add(v[c] + p_val[pos], SERIES_PARALLEL, c, p_i[pos], p_j[pos])
+            pos = _neighbours(p_val, shunt, width)
+            add(1 / (1 / v[c] + 1 / p_val[pos]), PARALLEL3, c, p_i[pos], p_j[pos])
+            pos = _neighbours(s_val, shunt, width)
+            add(1 / (1 / v[c] + 1 / s_val[pos]), PARALLEL_SERIES, c, s_i[pos], s_j[pos])
+        if not with_parts:
+            return np.concatenate(values, axis=1), None, None
+        return np.concatenate(values, axis=1), np.concatenate(topologies, axis=1), np.concatenate(indices, axis=1)
+
+    def best(self, targets, parts: int = 2, chunk: int = 1024) -> np.ndarray:
+        """ value of the best combination of up to parts standard values for every target, vectorized """
+        targets = np.atleast_1d(np.asarray(targets, dtype=float))
+        result = np.empty_like(targets)
+        for first in range(0, len(targets), chunk):
+            t = targets[first:first + chunk]
+            values, _, _ = self._candidates(t, parts, 1, with_parts=False)
+            best = np.abs(values / t[:, np.newaxis] - 1).argmin(axis=1)
+            result[first:first + chunk] = values[np.arange(len(t)), best]
+        return result
+
+    def combinations(self, target: [int | float], parts: int = 2, k: int = 5) -> list[Combination]:
+        """ the k combinations of up to parts (1, 2 or 3) standard values closest to target """
+        if parts not in (1, 2, 3):
+            raise ValueError(f'parts must be 1, 2 or 3, got {parts}')
+        values, topologies, indices = (x[0] for x in self._candidates(np.array([float(target)]), parts, k))
+        errors = values / target - 1
+        found, seen = [], set()
+        for n in np.argsort(np.abs(errors), kind='stable'):
+            topology = int(topologies[n])
+            combination = [self._sorted[i] for i in indices[n] if i >= 0]
+            key = (topology, combination[0], *sorted(combination[1:])) \
+                if topology in (SERIES_PARALLEL, PARALLEL_SERIES) else (topology, *sorted(combination))
+            if key in seen:
+                continue
+            seen.add(key)
+            found.append(Combination(float(values[n]), float(errors[n]), topology, tuple(combination)))
+            if len(found) == k:
+                break
+        return found
@@ -0,0 +1,147 @@
+# Chapter-6/exact.py
+
+"""
+# - Network reduction without intermediate rounding, values are only rounded when they are shown
+# - backend 'exact' carries every value as a Fraction, floats are read by their decimal text so 0.1 is 1/10,
+#   backend 'float' is the fast path, one correctly rounded math.fsum per reduction so the result
+#   does not depend on the order of the parts
+# - convergents walks the continued fraction of a value, the best rational approximations of it
+
+"""
+import math
+from fractions import Fraction
+from typing import NamedTuple
+
+BACKENDS = ('exact', 'float')
+
+
+class Reduction(NamedTuple):
+    """ rt, it and the voltage drop (series) or branch current (parallel) of every part, unrounded """
+    rt: [Fraction | float]
+    it: [Fraction | float]
+    parts: tuple
+
+
+def to_exact(value: [int | float | str | Fraction]) -> Fraction:
+    """
+    Examples:
+        >>> to_exact(0.1), to_exact('4.7k'.replace('k', 'e3')), to_exact(33)
+        (Fraction(1, 10), Fraction(4700, 1), Fraction(33, 1))
+    """
+    return value if isinstance(value, Fraction) else Fraction(value if isinstance(value, int) else str(value))
+
+
+def _converter(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f'backend must be one of {BACKENDS}, got {backend!r}')
+    return to_exact if backend == 'exact' else float
+
+
+def series(ohms, backend: str = 'exact'):
+    """
+    rt = r1 + r2 + ...
+    Examples:
+        >>> series([0.1] * 10)
+        Fraction(1, 1)
+        >>> series([0.1] * 10, backend='float'), sum([0.1] * 10)
+        (1.0, 0.9999999999999999)
+    """
+    convert = _converter(backend)
+    values = [convert(r) for r in ohms]
+    return sum(values, Fraction(0)) if backend == 'exact' else math.fsum(values)
+
+
+def parallel(ohms, backend: str = 'exact'):
+    """
+    1/rt = 1/r1 + 1/r2 + ...
+    Examples:
+        >>> parallel([100, 200, 300])
+        Fraction(600, 11)
+        >>> round(float(parallel([100, 200, 300])), 2)
+        54.55
+    """
+    convert = _converter(backend)
+    if backend == 'exact':
+        return 1 / sum((1 / convert(r) for r in ohms), Fraction(0))
+    return 1 / math.fsum(1 / convert(r) for r in ohms)
+
+
+def reduce_series(ohms, volts, backend: str = 'exact') -> Reduction:
+    """
+    Examples:
+        >>> reduce_series([100, 200], 100)
+        Reduction(rt=Fraction(300, 1), it=Fraction(1, 3), parts=(Fraction(100, 3), Fraction(200, 3)))
+    """
+    convert = _converter(backend)
+    ohms = [convert(r) for r in ohms]
+    volts = convert(volts)
+    rt = series(ohms, backend)
+    return Reduction(rt, volts / rt, tuple(r / rt * volts for r in ohms))
+
+
+def reduce_parallel(ohms, volts, backend: str = 'exact') -> Reduction:
+    """ parts are the branch currents """
+    convert = _converter(backend)
+    ohms = [convert(r) for r in ohms]
+    volts = convert(volts)
+    rt = parallel(ohms, backend)
+    return Reduction(rt, volts / rt, tuple(volts / r for r in ohms))
+
+
+def ladder(series_ohms, shunt_ohms, load=None, backend: str = 'exact'):
+    """
+    Input resistance of a ladder, series_ohms[k] then shunt_ohms[k] to ground at every rung,
+    reduced from the far end, load (open when None) across the last shunt
+    Examples:
+        >>> ladder([1] * 3, [1] * 3)
+        Fraction(13, 8)
+        >>> ladder([1] * 3, [2] * 3, load=2)
+        Fraction(2, 1)
+    """
+    convert = _converter(backend)
+    end = None if load is None else convert(load)
+    for r, shunt in zip(reversed(list(series_ohms)), reversed(list(shunt_ohms))):
+        shunt = convert(shunt)
+        end = convert(r) + (shunt if end is None else shunt * end / (shunt + end))
+    return end
+
+
+def present(value, decimals: int = 2) -> float:
+    """ the only rounding, applied when a value is shown """
+    return round(float(value), decimals)
+
+
+def continued_fraction(number):
+    """
+    Terms of the continued fraction of number, floats are read by their decimal text so the expansion ends
+    Examples:
+        >>> list(continued_fraction(Fraction(415, 93)))
+        [4, 2, 6, 7]
+        >>> list(continued_fraction(3.245))
+        [3, 4, 12, 4]
+    """
+    number = to_exact(number)
+    while True:
+        yield (whole_part := math.floor(number))
+        fractional_part = number - whole_part
+        if not fractional_part:
+            break
+        number = 1 / fractional_part
+
+
+def convergents(number, max_denominator: [int | None] = None):
+    """
+    Best rational approximations of number from its continued fraction, each closer than the last,
+    stops once the denominator would pass max_denominator
+    Examples:
+        >>> [str(f) for f in convergents(math.pi, max_denominator=1000)]
+        ['3', '22/7', '333/106', '355/113']
+        >>> list(convergents(parallel([100, 200, 300]), max_denominator=20))
+        [Fraction(54, 1), Fraction(55, 1), Fraction(109, 2), Fraction(600, 11)]
+    """
+    h0, h1, k0, k1 = 0, 1, 1, 0
+    for term in continued_fraction(number):
+        h0, h1, k0, k1 = h1, term * h1 + h0, k1, term * k1 + k0
+        if max_denominator is not None and k1 > max_denominator:
+            return
+        yield Fraction(h1, k1)
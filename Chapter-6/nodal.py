@@ -0,0 +1,240 @@
+# Chapter-6/nodal.py
+
+"""
+# - DC nodal analysis of resistor networks that are neither pure series nor pure parallel
+# - builds a sparse modified-nodal-analysis (MNA) matrix from a netlist and solves it with SciPy
+# - nodes are numbered 0, 1, 2, ... and node 0 is ground
+# - the LU factorization of the matrix is kept until a resistor or voltage source is added, so repeated
+#   solves and Thevenin/Norton equivalents of any pair of terminals are back substitutions only
+
+"""
+from array import array
+from typing import NamedTuple
+
+import numpy as np
+
+from resistor import Resistor
+
+
+class NodalSolution(NamedTuple):
+    """ voltages[node], currents[resistor] from node a to node b, source_currents[voltage source] out of its + node """
+    voltages: np.ndarray
+    currents: np.ndarray
+    source_currents: np.ndarray
+
+
+class Equivalent(NamedTuple):
+    """
+    Thevenin equivalent seen from two terminals, volts open circuit behind ohms,
+    the Norton equivalent is norton_amps in parallel with the same ohms
+    """
+    volts: float
+    ohms: float
+
+    @property
+    def norton_amps(self) -> float:
+        return self.volts / self.ohms
+
+    def load(self, ohms) -> 'LoadSweep':
+        """ volts across, current through and power in every load resistor of an array in one vectorized pass """
+        ohms = np.asarray(ohms, dtype=float)
+        current = self.volts / (self.ohms + ohms)
+        return LoadSweep(ohms, current * ohms, current, current * current * ohms)
+
+
+class LoadSweep(NamedTuple):
+    """ Results of Equivalent.load, one entry per load resistor """
+    ohms: np.ndarray
+    volts: np.ndarray
+    current: np.ndarray
+    power: np.ndarray
+
+
+class Netlist:
+    """
+    Resistors, voltage sources and current sources between numbered nodes
+    Examples:
+        >>> n = Netlist()
+        >>> n.add(Resistor(100, name='R1'), 1, 2)
+        >>> n.add(Resistor(100, name='R2'), 2, 0)
+        >>> n.add(Resistor(200, name='R3'), 2, 0)
+        >>> n.voltage_source(10, 1, 0)
+        >>> s = n.solve()
+        >>> s.voltages.round(3).tolist()
+        [0.0, 10.0, 4.0]
+        >>> s.currents.round(3).tolist()
+        [0.06, 0.04, 0.02]
+        >>> s.source_currents.round(3).tolist()
+        [0.06]
+        >>> n.solve(method='cg').voltages.round(3).tolist()
+        [0.0, 10.0, 4.0]
+    """
+
+    def __init__(self):
+        self._a = array('q')
+        self._b = array('q')
+        self._ohms = array('d')
+        self._vs = []  # (volts, plus, minus)
+        self._is = []  # (amps, from node, to node)
+        self._lu = None  # (nodes, factorization of the MNA matrix) until the matrix changes
+
+    def add(self, resistor: [Resistor | int | float], a: int, b: int):
+        """ resistor between node a and node b """
+        self._lu = None
+        self._a.append(a)
+        self._b.append(b)
+        self._ohms.append(resistor.ohms if isinstance(resistor, Resistor) else resistor)
+
+    def add_many(self, ohms, a, b):
+        """ many resistors at once from equal length sequences of ohms and node numbers """
+        self._lu = None
+        self._a.extend(np.asarray(a, dtype=np.int64).tolist())
+        self._b.extend(np.asarray(b, dtype=np.int64).tolist())
+        self._ohms.extend(np.asarray(ohms, dtype=float).tolist())
+
+    def voltage_source(self, volts: [int | float], plus: int, minus: int = 0):
+        self._lu = None
+        self._vs.append((volts, plus, minus))
+
+    def current_source(self, amps: [int | float], source: int, sink: int = 0):
+        """ amps flow through the source from node source to node sink, i.e. out of source and into sink """
+        self._is.append((amps, source, sink))
+
+    @property
+    def nodes(self) -> int:
+        """ number of nodes including ground """
+        ends = [max(self._a, default=0), max(self._b, default=0)]
+        ends += [max(p, m) for _, p, m in self._vs] + [max(f, t) for _, f, t in self._is]
+        return max(ends) + 1
+
+    def _arrays(self):
+        return (np.frombuffer(self._a, dtype=np.int64), np.frombuffer(self._b, dtype=np.int64),
+                np.frombuffer(self._ohms, dtype=float))
+
+    def _conductance(self, size):
+        """ stamps 1/R into a (size x size) matrix with ground row and column removed """
+        a, b, ohms = self._arrays()
+        g = 1 / ohms
+        rows = np.concatenate([a, b, a, b])
+        cols = np.concatenate([a, b, b, a])
+        vals = np.concatenate([g, g, -g, -g])
+        keep = (rows > 0) & (cols > 0)
+        return rows[keep] - 1, cols[keep] - 1, vals[keep]
+
+    def _injected(self, n):
+        i = np.zeros(n)
+        for amps, source, sink in self._is:
+            i[sink] += amps
+            i[source] -= amps
+        return i
+
+    def solve(self, method: str = 'direct', rtol: float = 1e-10) -> NodalSolution:
+        """
+        - method='direct' factors the full MNA matrix (any voltage sources)
+        - method='cg' runs conjugate gradients on the conductance matrix, every voltage source must have
+          its minus terminal on ground
+        """
+        n = self.nodes
+        if method == 'direct':
+            voltages, source_currents = self._solve_direct(n)
+        elif method == 'cg':
+            voltages, source_currents = self._solve_cg(n, rtol)
+        else:
+            raise ValueError(f"unsupported method: {method}, expected 'direct' or 'cg'")
+        a, b, ohms = self._arrays()
+        return NodalSolution(voltages, (voltages[a] - voltages[b]) / ohms, source_currents)
+
+    def _factor(self, n):
+        """ LU factorization of the MNA matrix, built on first use and reused until the netlist changes """
+        if self._lu is None or self._lu[0] != n:
+            from scipy.sparse.linalg import splu
+
+            self._lu = (n, splu(self._mna(n)))
+        return self._lu[1]
+
+    def _mna(self, n):
+        # scipy is imported by the solvers that use it, importing nodal stays cheap
+        from scipy.sparse import coo_matrix
+
+        m = len(self._vs)
+        rows, cols, vals = self._conductance(n - 1)
+        extra_rows, extra_cols, extra_vals = [], [], []
+        for k, (_, plus, minus) in enumerate(self._vs):
+            for node, sign in ((plus, 1.0), (minus, -1.0)):
+                if node > 0:
+                    extra_rows += [node - 1, n - 1 + k]
+                    extra_cols += [n - 1 + k, node - 1]
+                    extra_vals += [sign, sign]
+        size = n - 1 + m
+        return coo_matrix((np.concatenate([vals, extra_vals]),
+                           (np.concatenate([rows, extra_rows]), np.concatenate([cols, extra_cols]))),
+                          shape=(size, size)).tocsc()
+
+    def _solve_direct(self, n):
+        rhs = np.concatenate([self._injected(n)[1:], [volts for volts, _, _ in self._vs]])
+        x = self._factor(n).solve(rhs)
+        # the MNA unknown is the current into the + terminal, report it as current delivered
+        return np.concatenate([[0.0], x[:n - 1]]), -x[n - 1:]
+
+    def _solve_cg(self, n, rtol):
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.linalg import cg
+
+        fixed = np.zeros(n, dtype=bool)
+        voltages = np.zeros(n)
+        fixed[0] = True
+        for volts, plus, minus in self._vs:
+            if minus != 0:
+                raise ValueError(f"method='cg' needs voltage sources referenced to ground, got {minus=}")
+            fixed[plus] = True
+            voltages[plus] = volts
+        rows, cols, vals = self._conductance(n - 1)
+        g = coo_matrix((vals, (rows, cols)), shape=(n - 1, n - 1)).tocsr()
+        free = np.flatnonzero(~fixed[1:])
+        known = np.flatnonzero(fixed[1:])
+        rhs = self._injected(n)[1:][free] - g[free][:, known] @ voltages[1:][known]
+        reduced = g[free][:, free]
+        jacobi = coo_matrix((1 / reduced.diagonal(), (np.arange(len(free)), np.arange(len(free)))),
+                            shape=reduced.shape).tocsr()
+        x, info = cg(reduced, rhs, rtol=rtol, atol=0.0, M=jacobi, maxiter=10 * len(free))
+        if info != 0:
+            raise ArithmeticError(f'conjugate gradients did not converge ({info=})')
+        voltages[1 + free] = x
+        # current delivered by each source is what the rest of the network draws from its node
+        residual = g @ voltages[1:] - self._injected(n)[1:]
+        return voltages, np.array([residual[plus - 1] for _, plus, _ in self._vs])
+
+    def thevenin(self, a: int, b: int = 0) -> Equivalent:
+        """
+        Thevenin (and Norton) equivalent of the network seen from terminals a and b, two back substitutions
+        on the cached factorization: the open circuit volts, and 1A driven from b to a with the sources off
+        Examples:
+            Fig 6-44 and 6-45, 10V divided by 100 and 47 + 22 ohms, then 100 ohms out to terminal 4
+            >>> n = Netlist()
+            >>> n.voltage_source(10, 1)
+            >>> n.add_many([100, 47, 22, 100], [1, 2, 3, 2], [2, 3, 0, 4])
+            >>> e = n.thevenin(4)
+            >>> round(e.volts, 2), round(e.ohms, 2), round(e.norton_amps * 1e3, 2)
+            (4.08, 140.83, 28.99)
+            >>> e.load([140.83, 1e3]).power.round(5).tolist()
+            [0.02959, 0.01281]
+        """
+        n = max(self.nodes, a + 1, b + 1)
+        lu = self._factor(n)
+        size = n - 1 + len(self._vs)
+        rhs = np.zeros((size, 2))
+        rhs[:n - 1, 0] = self._injected(n)[1:]
+        rhs[n - 1:, 0] = [volts for volts, _, _ in self._vs]
+        for node, amps in ((a, 1.0), (b, -1.0)):
+            if node > 0:
+                rhs[node - 1, 1] += amps
+        x = np.vstack([np.zeros((1, 2)), lu.solve(rhs)[:n - 1]])
+        volts, ohms = x[a] - x[b]
+        return Equivalent(float(volts), float(ohms))
+
+    def __len__(self):
+        return len(self._ohms)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.nodes:,} nodes, {len(self):,} resistors, ' \
+               f'{len(self._vs)} voltage sources, {len(self._is)} current sources)'
@@ -6,17 +6,73 @@
 
 """
 from dataclasses import fields
-import traceback
+from typing import NamedTuple
+import functools
+import linecache
+import sys
+
+import numpy as np
+
+from exact import Reduction, reduce_parallel, reduce_series
+
+REFERENCE_TEMPERATURE = 25.0  # \u00B0C at which the nominal values of tolerance and tempco parts are specified
+CACHE_SIZE = 4096  # distinct series circuits whose derived values are shared process wide
+
+
+def _caller_source(depth: int = 2):
+    """ (filename, line number) of the statement constructing an object, cheap enough to call from __init__ """
+    frame = sys._getframe(depth)
+    return frame.f_code.co_filename, frame.f_lineno
+
+
+def _assigned_name(source) -> str:
+    """ Name on the left of the '=' in the source line, e.g. 'r33' for r33 = Resistor(33) """
+    text = linecache.getline(*source).strip()
+    return text[:text.find('=')].strip()
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE, typed=True)
+def _series_values(volts, *ohms):
+    """ (rt, it, voltage drops) of a series circuit, shared by every Series of the same values """
+    rt = sum(ohms)
+    return rt, round(volts / rt, 2), tuple(round((r / rt) * volts, 2) for r in ohms)
+
+
+def cache_info():
+    """ hits, misses, maxsize and currsize of the process wide cache of series circuit values
+    Examples:
+        >>> cache_clear()
+        >>> s = Series([Resistor(10, name='R1'), Resistor(30, name='R2')], 4, name='S')
+        >>> s.voltage_drops, s.it, s.rt
+        ({'R1=10Ω': 1.0, 'R2=30Ω': 3.0}, 0.1, 40)
+        >>> s.volts = 8
+        >>> s.voltage_drops
+        {'R1=10Ω': 2.0, 'R2=30Ω': 6.0}
+        >>> Series([Resistor(10, name='R3'), Resistor(30, name='R4')], 8, name='T').rt
+        40
+        >>> cache_info()
+        CacheInfo(hits=1, misses=2, maxsize=4096, currsize=2)
+    """
+    return _series_values.cache_info()
+
+
+def cache_clear():
+    _series_values.cache_clear()
 
 
 class Resistor:
     """Attributes of one resistor
     """
 
-    def __init__(self, ohms: [int, float]):
+    def __init__(self, ohms: [int, float], name: [str | None] = None, tolerance: float = 0.05,
+                 tempco: [int | float] = 0):
         """
         Parameters:
             ohms[int | float]: Value of the resistor in ohms
+            name[str | None]: Symbol of the resistor, when omitted it is read from the
+                assignment in the calling source line the first time it is needed
+            tolerance[float]: Fraction the value may be off from ohms, 0.05 is a gold band
+            tempco[int | float]: Temperature coefficient in ppm/K
 
         Examples:
         >>> r1 = Resistor(ohms=100)
@@ -32,27 +88,44 @@ class Resistor:
 
         >>> r1.ohms
         100
+
+        >>> r1.symbol
+        'r1'
+
+        >>> Resistor(47, name='R4').symbol
+        'R4'
+
+        >>> round(Resistor(1000, tempco=100).ohms_at(75), 2)
+        1005.0
     """
 
         self._ohms = ohms
         self._volts = 10
-        (filename, line_number, function_name, text) = traceback.extract_stack()[-2]
-        self._def_name = text[:text.find('=')].strip()
+        self.tolerance = tolerance
+        self.tempco = tempco
+        self._def_name = name
+        self._source = None if name is not None else _caller_source()
 
     @property
     def symbol(self):
+        if self._def_name is None:
+            self._def_name = _assigned_name(self._source)
         return self._def_name
 
     @property
     def ohms(self):
         return self._ohms
 
+    def ohms_at(self, temperature: [int | float]) -> float:
+        """ Value in ohms at temperature in \u00B0C, the nominal value is at REFERENCE_TEMPERATURE """
+        return self._ohms * (1 + self.tempco * 1e-6 * (temperature - REFERENCE_TEMPERATURE))
+
     def current(self, voltage):
         return round(float(voltage / self._ohms), 2)
 
     @property
-    def volts(self, volts):
-        self._volts = volts
+    def volts(self):
+        return self._volts
 
     @volts.setter
     def volts(self, value):
@@ -86,23 +159,52 @@ class Series:
     ## Passed a list of resistor values, and voltages, it will calculate voltage drop across each resistor , total resistance and total current
     """
 
-    def __init__(self, resistors: list[Resistor], vs: [int, float]):
+    def __init__(self, resistors: list[Resistor], vs: [int, float], name: [str | None] = None):
         """
         - resistors is a list of resistors in ohms
         - vs is the voltage source in volts
+        - name is the symbol of the circuit, read lazily from the calling source line when omitted
         Examples:
             >>> r10 = Resistor(10)
             >>> s2 = Series([r10,r10],10)
             >>> s2.volts # volts
             10
+            >>> s2.symbol
+            's2'
 
         param resistors:list[int,float]
         param volts:[int,float]
         """
-        self._resistors = resistors
+        self._resistors = tuple(resistors)  # a copy, appending to the caller's list would not clear _derived
         self._volts = vs
-        (filename, line_number, function_name, text) = traceback.extract_stack()[-2]
-        self._def_name = text[:text.find('=')].strip()
+        self._def_name = name
+        self._source = None if name is not None else _caller_source()
+        self._derived = None  # (rt, it, drops) until volts changes
+
+    def _values(self):
+        if self._derived is None:
+            self._derived = _series_values(self._volts, *(r.ohms for r in self._resistors))
+        return self._derived
+
+    @property
+    def symbol(self):
+        if self._def_name is None:
+            self._def_name = _assigned_name(self._source)
+        return self._def_name
+
+    @property
+    def resistors(self) -> tuple[Resistor, ...]:
+        """ derived values are cached until volts is set, build a new Series to change the resistors
+        Examples:
+            >>> parts = [Resistor(10, name='R1')]
+            >>> s = Series(parts, 10, name='S')
+            >>> s.rt
+            10
+            >>> parts.append(Resistor(30, name='R2'))
+            >>> s.rt, len(s.resistors)
+            (10, 1)
+        """
+        return self._resistors
 
     @property
     def rt(self):
@@ -117,9 +219,7 @@ class Series:
 
         return: Total Ohms in the series circuit
         """
-        rt = 0
-        [rt := rt + r.ohms for r in self._resistors]
-        return rt
+        return self._values()[0]
 
     @property
     def it(self):
@@ -133,30 +233,20 @@ class Series:
 
         return: Total Current in the series circuit
         """
-        it = self._volts / self.rt
-        return round(it, 2)
+        return self._values()[1]
 
     @property
     def voltage_drops(self):
         """
         voltage_drop = resistance/rt * volts
         Examples:
-            >>> R100 = Resistor(100)
-            >>> R200 = Resistor(200)
-            >>> s5 = Series([R100,R200],100)
+            >>> s5 = Series([Resistor(100, name='R100'), Resistor(200, name='R200')], 100, name='s5')
             >>> s5.voltage_drops
             {'R100=100Ω': 33.33, 'R200=200Ω': 66.67}
 
-        {'R1=100Ω': 5.0, 'R2=100Ω': 5.0}
-
         return: Voltage drop dictionary, for each resitor in the circuit
         """
-        drops = dict()
-        n = 1
-        for r in self._resistors:
-            drops[f'{r.symbol.upper()}={r.ohms}\u03A9'] = round((r.ohms / self.rt) * self.volts, 2)
-            n += 1
-        return drops
+        return {f'{r.symbol.upper()}={r.ohms}\u03A9': drop for r, drop in zip(self._resistors, self._values()[2])}
 
     @property
     def volts(self):
@@ -170,6 +260,46 @@ class Series:
     @volts.setter
     def volts(self, value):
         self._volts = value
+        self._derived = None
+
+    def exact(self, backend: str = 'exact') -> Reduction:
+        """
+        rt, it and voltage drops without rounding, as Fractions, or fsum floats with backend='float'
+        Examples:
+            >>> s6 = Series([Resistor(100, name='R1'), Resistor(200, name='R2')], 100)
+            >>> r = s6.exact()
+            >>> r.it, [str(v) for v in r.parts]
+            (Fraction(1, 3), ['100/3', '200/3'])
+        """
+        return reduce_series([r.ohms for r in self._resistors], self._volts, backend)
+
+    @staticmethod
+    def batch(ohms, volts, decimals: [int | None] = 2) -> 'SeriesBatch':
+        """
+        Vectorized rt, it and voltage drops for many series networks in one pass
+        - ohms is a 2-D array, one network per row, resistor values in ohms
+        - volts is the source voltage, one per network or a single value for all of them
+        - decimals rounds like the per-object properties, None returns the raw values
+        Examples:
+            >>> b = Series.batch([[100, 200], [33, 68]], [100, 10])
+            >>> b.rt.tolist()
+            [300.0, 101.0]
+            >>> b.it.tolist()
+            [0.33, 0.1]
+            >>> b.drops.tolist()
+            [[33.33, 66.67], [3.27, 6.73]]
+
+        return: SeriesBatch(rt, it, drops)
+        """
+        ohms = np.atleast_2d(np.asarray(ohms, dtype=float))
+        volts = np.broadcast_to(np.asarray(volts, dtype=float), ohms.shape[:1])
+        rt = ohms.sum(axis=1)
+        it = volts / rt
+        drops = (ohms / rt[:, np.newaxis]) * volts[:, np.newaxis]
+        if decimals is not None:
+            it = np.round(it, decimals)
+            drops = np.round(drops, decimals)
+        return SeriesBatch(rt, it, drops)
 
     def __repr__(self):
         return f"rt={self.rt} \u03A9" \
@@ -180,30 +310,158 @@ class Series:
 class Parallel:
     """Class will calculate current, total ohms for parallel resistors"""
 
-    def __init__(self, resistors: list[Resistor], volts: [int | float] = 1):
-        self._resistors = resistors
+    def __init__(self, resistors: list[Resistor], volts: [int | float] = 1, name: [str | None] = None):
+        """
+        - name is the symbol of the circuit, read lazily from the calling source line when omitted
+        Examples:
+            >>> p2 = Parallel([Resistor(100), Resistor(100)])
+            >>> p2.symbol, p2.rt()
+            ('p2', 50.0)
+        """
+        self._resistors = tuple(resistors)
         self._volts = volts
+        self._def_name = name
+        self._source = None if name is not None else _caller_source()
 
         for r in self._resistors:
             r.volts = self._volts
 
+    @property
+    def symbol(self):
+        if self._def_name is None:
+            self._def_name = _assigned_name(self._source)
+        return self._def_name
+
+    @property
+    def resistors(self) -> tuple[Resistor, ...]:
+        return self._resistors
+
+    @property
+    def volts(self):
+        return self._volts
+
+    def exact(self, backend: str = 'exact') -> Reduction:
+        """
+        rt, it and branch currents without rounding, as Fractions, or fsum floats with backend='float'
+        Examples:
+            >>> p3 = Parallel([Resistor(100), Resistor(200), Resistor(300)], 10)
+            >>> p3.exact().rt, p3.rt()
+            (Fraction(600, 11), 54.55)
+        """
+        return reduce_parallel([r.ohms for r in self._resistors], self._volts, backend)
+
     def rt(self) -> float:
         total = 0
         [total := total + r.ohms ** -1 for r in self._resistors]
         return round(float(total ** -1), 2)
 
+    def branch_currents(self) -> np.ndarray:
+        """ current through every resistor at the circuit volts, unrounded """
+        return self.branches(self._ohms_array(), self._volts).currents
+
+    def branch_power(self) -> np.ndarray:
+        """ power in every resistor at the circuit volts, unrounded """
+        return self.branches(self._ohms_array(), self._volts).power
+
+    def power(self) -> float:
+        """
+        Total power drawn from the source
+        Examples:
+            >>> p4 = Parallel([Resistor(100, name='R1'), Resistor(200, name='R2')], 10)
+            >>> p4.branch_currents().tolist(), p4.branch_power().tolist(), p4.power()
+            ([0.1, 0.05], [1.0, 0.5], 1.5)
+            >>> p4.resistors[0].volts
+            10
+        """
+        return float(self.branches(self._ohms_array(), self._volts).total_power)
+
+    def _ohms_array(self):
+        return np.fromiter((r.ohms for r in self._resistors), dtype=float, count=len(self._resistors))
+
+    @staticmethod
+    def branches(ohms, volts=1) -> 'ParallelBranches':
+        """
+        Branch currents and power of parallel banks in one pass over the conductances G = 1/R,
+        I = G * V and P = G * V^2 per branch, totals summed over the branches
+        - ohms is 1-D for one bank or 2-D with one bank per row, volts one value or one per bank
+        Examples:
+            >>> b = Parallel.branches([[100, 100, 50], [1000, 1000, 1000]], [10, 5])
+            >>> b.currents.tolist()
+            [[0.1, 0.1, 0.2], [0.005, 0.005, 0.005]]
+            >>> b.it.tolist(), b.total_power.round(6).tolist()
+            ([0.4, 0.015], [4.0, 0.075])
+        """
+        conductance = np.reciprocal(np.asarray(ohms, dtype=float))
+        volts = np.asarray(volts, dtype=float)
+        if conductance.ndim > 1:
+            volts = volts.reshape(volts.shape + (1,) * (conductance.ndim - volts.ndim))
+        currents = conductance * volts
+        power = currents * volts
+        return ParallelBranches(conductance, currents, power, currents.sum(axis=-1), power.sum(axis=-1))
+
+    @staticmethod
+    def batch(ohms, volts=1, decimals: [int | None] = 2) -> 'ParallelBatch':
+        """
+        Vectorized rt and it for many parallel networks in one pass
+        - ohms is a 2-D array, one network per row, resistor values in ohms
+        - volts is the source voltage, one per network or a single value for all of them
+        Examples:
+            >>> b = Parallel.batch([[100, 100], [200, 100]], 10)
+            >>> b.rt.tolist()
+            [50.0, 66.67]
+            >>> b.it.tolist()
+            [0.2, 0.15]
+
+        return: ParallelBatch(rt, it)
+        """
+        ohms = np.atleast_2d(np.asarray(ohms, dtype=float))
+        volts = np.broadcast_to(np.asarray(volts, dtype=float), ohms.shape[:1])
+        rt = np.reciprocal(np.reciprocal(ohms).sum(axis=1))
+        it = volts / rt
+        if decimals is not None:
+            rt = np.round(rt, decimals)
+            it = np.round(it, decimals)
+        return ParallelBatch(rt, it)
+
+
+class SeriesBatch(NamedTuple):
+    """Results of Series.batch, one entry (or row of drops) per network"""
+    rt: np.ndarray
+    it: np.ndarray
+    drops: np.ndarray
+
+
+class ParallelBatch(NamedTuple):
+    """Results of Parallel.batch, one entry per network"""
+    rt: np.ndarray
+    it: np.ndarray
+
+
+class ParallelBranches(NamedTuple):
+    """Results of Parallel.branches, per branch arrays with the shape of ohms, totals one per bank"""
+    conductance: np.ndarray
+    currents: np.ndarray
+    power: np.ndarray
+    it: np.ndarray
+    total_power: np.ndarray
+
+
+def demo():
+    r33 = Resistor(33)
+    r68 = Resistor(68)
+    r3 = Resistor(100)
+    r4 = Resistor(47)
+    r5 = Resistor(10)
+    x = Series([r33, r68, r3, r4, r5], 10)
+    print(x)
+
+    r6 = Resistor(100)
+    s1 = Series([r6, r6], 10)
+    print(s1)
 
-r33 = Resistor(33)
-r68 = Resistor(68)
-r3 = Resistor(100)
-r4 = Resistor(47)
-r5 = Resistor(10)
-x = Series([r33, r68, r3, r4, r5], 10)
-print(x)
+    p1 = Parallel([r3, r3])
+    print(p1.rt())
 
-r6 = Resistor(100)
-s1 = Series([r6, r6], 10)
-print(s1)
 
-p1 = Parallel([r3, r3])
-print(p1.rt())
+if __name__ == '__main__':
+    demo()
@@ -0,0 +1,60 @@
+# Chapter-9/benchmarks.py
+
+"""
+# - Timing of the capacitor waveform and transient simulation code
+# - run with python benchmarks.py from the Chapter-9 directory
+
+"""
+import time
+
+import numpy as np
+
+from capacitor_bank import parallel, series
+from transient import RCStage, StateSpace, pwm, simulate_adaptive, simulate_exact
+
+
+def _samples_per_second(chunks):
+    start = time.perf_counter()
+    samples = sum(len(chunk.time) for chunk in chunks)
+    return samples, samples / (time.perf_counter() - start)
+
+
+def bench_transient(exact_samples=10 ** 7, adaptive_samples=10 ** 5):
+    """
+    Prints samples per second for a 3 stage RC filter on a PWM input (exact)
+    and a series RLC circuit on the same input (adaptive)
+    """
+    source = pwm(volts=5, frequency=1e3, duty=0.3)
+    stages = [RCStage(10e3, .01e-6)] * 3
+    n, rate = _samples_per_second(simulate_exact(stages, source, step=1e-6, count=exact_samples))
+    print(f'exact    3 x RC   {n:>12,} samples {rate:14,.0f} samples/s')
+    rlc = StateSpace.series_rlc(ohms=100, henries=10e-3, farads=1e-6)
+    n, rate = _samples_per_second(simulate_adaptive(rlc, source, step=1e-6, count=adaptive_samples, max_step=1e-5))
+    print(f'adaptive RLC      {n:>12,} samples {rate:14,.0f} samples/s')
+
+
+def bench_capacitor_bank(banks=10 ** 5, scalar_limit=10 ** 3, seed=0):
+    """
+    Prints the time to split 60V across banks banks of three parallel strings of four capacitors,
+    one bank at a time (timed on scalar_limit banks and scaled up) against all of them as one array
+    """
+    bank = parallel(*(series(*[1e-6] * 4) for _ in range(3)))
+    farads = np.random.default_rng(seed).uniform(0.8e-6, 1.2e-6, size=(banks, len(bank)))
+    m = min(banks, scalar_limit)
+    start = time.perf_counter()
+    for row in farads[:m]:
+        bank.split(60, row)
+    scalar = (time.perf_counter() - start) * banks / m
+    start = time.perf_counter()
+    state = bank.split(60, farads)
+    vector = time.perf_counter() - start
+    start = time.perf_counter()
+    bank.charge_curve(np.linspace(0, 5e-3, 100), 60, 100, farads)
+    curve = time.perf_counter() - start
+    print(f'capacitor bank {banks:,} banks x {len(bank)} capacitors one at a time={scalar:.3f}s '
+          f'batch={vector:.4f}s charge curve x100={curve:.3f}s worst capacitor {state.volts.max():.2f}V')
+
+
+if __name__ == '__main__':
+    bench_transient()
+    bench_capacitor_bank()
@@ -10,13 +10,35 @@ __project__ = 'Fluent Python'
 # python -m pip install mkdocs-material
 #
 import math
+from itertools import count as _count
+
+import numpy as np
 
 DEGREE_SYMBOL = "\u03B1"
+REFERENCE_TEMPERATURE = 25.0  # \u00B0C at which capacitance is specified
+
+
 class Capacitor:
-    def __init__(self, capacitance: [int | float] = 2.2e-6, ohms: [int | float] = 10e3, volts: [int | float] = 50.0):
+    def __init__(self, capacitance: [int | float] = 2.2e-6, ohms: [int | float] = 10e3, volts: [int | float] = 50.0,
+                 tolerance: float = 0.1, tempco: [int | float] = 0, name: [str | None] = None):
+        """
+        - name is an optional symbol such as C1
+        - tolerance is the fraction the capacitance may be off, 0.1 for a K marked part
+        - tempco is the temperature coefficient in ppm/K, -750 for N750 ceramics
+        Examples:
+            >>> round(Capacitor(capacitance=1e-6, tempco=-750).capacitance_at(85) * 1e6, 3)
+            0.955
+        """
         self.capacitance = capacitance
         self.ohms = ohms
         self.volts: [int | float] = volts
+        self.tolerance = tolerance
+        self.tempco = tempco
+        self.name = name
+
+    def capacitance_at(self, temperature: [int | float]) -> float:
+        """ Capacitance in farads at temperature in \u00B0C """
+        return self.capacitance * (1 + self.tempco * 1e-6 * (temperature - REFERENCE_TEMPERATURE))
 
     @property
     def get_volts(self):
@@ -40,6 +62,51 @@ class Capacitor:
     def charge_time(self, time: [int | float]):
         return self.volts * (1 - math.exp(-(time / self.time_constant)))
 
+    def discharge_curve(self, times):
+        """ discharge_time for a whole array (NumPy or array('d')) of times in one vectorized call
+        Examples:
+            >>> c = Capacitor(capacitance=2.2e-6, ohms=2.2e3, volts=10)
+            >>> c.discharge_curve([0, 1e-3]).round(3).tolist()
+            [10.0, 8.133]
+        """
+        return self.volts * np.exp(-(np.asarray(times, dtype=float) / self.time_constant))
+
+    def charge_curve(self, times):
+        """ charge_time for a whole array (NumPy or array('d')) of times in one vectorized call
+        Examples:
+            >>> from array import array
+            >>> c = Capacitor(capacitance=.01e-6, ohms=8.2e3)
+            >>> c.charge_curve(array('d', [10e-6, 50e-6])).round(3).tolist()
+            [5.74, 22.826]
+        """
+        return self.volts * -np.expm1(-(np.asarray(times, dtype=float) / self.time_constant))
+
+    def iter_discharge_curve(self, step: [int | float], count: [int | None] = None, start: [int | float] = 0.0,
+                             chunk: int = 4096):
+        """ Yields the discharge waveform at start, start + step, ... as arrays of at most chunk samples,
+        count=None never stops, memory stays at one chunk whatever the number of samples """
+        return self._iter_curve(self.discharge_curve, step, count, start, chunk)
+
+    def iter_charge_curve(self, step: [int | float], count: [int | None] = None, start: [int | float] = 0.0,
+                          chunk: int = 4096):
+        """ Yields the charge waveform at start, start + step, ... as arrays of at most chunk samples
+        Examples:
+            >>> c = Capacitor(capacitance=.01e-6, ohms=8.2e3)
+            >>> [len(a) for a in c.iter_charge_curve(10e-6, count=10, chunk=4)]
+            [4, 4, 2]
+        """
+        return self._iter_curve(self.charge_curve, step, count, start, chunk)
+
+    @staticmethod
+    def _iter_curve(curve, step, count, start, chunk):
+        offsets = np.arange(chunk, dtype=float)
+        for first in _count(0, chunk):
+            if count is not None and first >= count:
+                return
+            n = chunk if count is None else min(chunk, count - first)
+            # times are rebuilt from the sample index so long runs do not accumulate rounding error
+            yield curve(start + (first + offsets[:n]) * step)
+
     @property
     def time_constant(self):
         """ Returns 1 time constant for capacitance and ohms provided """
@@ -57,18 +124,19 @@ class Capacitor:
 #
 # print(c.charge_time(50e-6))
 
-c = Capacitor(capacitance=.01e-6, ohms=8.2e3)
-print(c)
-print(f'Charge Time = {c.charge_time(10e-6):.3f} volts @ Time = {10e-6} ')
-print(f'Charge Time = {c.charge_time(50e-6):.3f} volts @ Time = {50e-6}')
-print(f'Discharge Time = {c.discharge_time(10e-6):.3f} volts @ Time = {10e-6}')
-c = Capacitor(capacitance=2.2e-6, ohms=10e3, volts=10)
-print(c.time_constant)
-print(f'Discharge Time = {c.discharge_time(6e-3):.3f} volts @ Time = {10e-3}')
-# Related problem 9-12 pp.406-407 2.2uF, 2.2K ohms and 1ms
-c = Capacitor(capacitance=2.2e-6, ohms=2.2e3, volts=10)
-print(c.time_constant)
-print(f'Discharge Time = {c.discharge_time(1e-3):.3f} volts @ Time = {10e-3}')
+def demo():
+    c = Capacitor(capacitance=.01e-6, ohms=8.2e3)
+    print(c)
+    print(f'Charge Time = {c.charge_time(10e-6):.3f} volts @ Time = {10e-6} ')
+    print(f'Charge Time = {c.charge_time(50e-6):.3f} volts @ Time = {50e-6}')
+    print(f'Discharge Time = {c.discharge_time(10e-6):.3f} volts @ Time = {10e-6}')
+    c = Capacitor(capacitance=2.2e-6, ohms=10e3, volts=10)
+    print(c.time_constant)
+    print(f'Discharge Time = {c.discharge_time(6e-3):.3f} volts @ Time = {10e-3}')
+    # Related problem 9-12 pp.406-407 2.2uF, 2.2K ohms and 1ms
+    c = Capacitor(capacitance=2.2e-6, ohms=2.2e3, volts=10)
+    print(c.time_constant)
+    print(f'Discharge Time = {c.discharge_time(1e-3):.3f} volts @ Time = {10e-3}')
 
 # print(f'{c.charge_time(20e-6):.3f} volts')
 # print(f'{c.charge_time(30e-6):.3f} volts')
@@ -86,3 +154,7 @@ print(f'Discharge Time = {c.discharge_time(1e-3):.3f} volts @ Time = {10e-3}')
 # z = [(x, c.discharge_time(x * 1e-6)) for x in range(0, 410, 10)]
 # for x in z:
 #     print(f'{x[0]},{x[1]}')
+
+
+if __name__ == '__main__':
+    demo()
@@ -0,0 +1,180 @@
+# Chapter-9/capacitor_bank.py
+
+"""
+# - Banks of capacitors in any nesting of series and parallel groups
+# - Ct = C1 + C2 + ... in parallel, 1/Ct = 1/C1 + 1/C2 + ... in series, every capacitor of a series group
+#   holds the same charge Q = Ct * V so the smallest one takes the largest share of the voltage
+# - one bank layout is evaluated for many sets of values at once, a (banks, capacitors) array of farads,
+#   giving the voltage, charge and stored energy (1/2 C V^2) of every capacitor and the bank charging or
+#   discharging through a resistor
+
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from capacitor import Capacitor
+
+
+class BankState(NamedTuple):
+    """ farads and energy per bank, volts, charge and energy per capacitor in bank order (one row per bank) """
+    farads: np.ndarray
+    volts: np.ndarray
+    charge: np.ndarray
+    energy: np.ndarray
+    total_energy: np.ndarray
+
+
+class BankCurve(NamedTuple):
+    """ bank volts and stored energy at every time, one row per bank """
+    time: np.ndarray
+    volts: np.ndarray
+    energy: np.ndarray
+
+
+class CapacitorBank:
+    """
+    Series or parallel group of Capacitors, values in farads or nested groups, build them with series()
+    and parallel()
+    Examples:
+        >>> bank = series(parallel(1e-6, 1e-6), 2e-6, Capacitor(capacitance=1e-6))
+        >>> round(bank.farads * 1e6, 3)
+        0.5
+        >>> state = bank.split(volts=12)
+        >>> state.volts.round(3).tolist()
+        [[3.0, 3.0, 3.0, 6.0]]
+        >>> (state.energy * 1e6).round(3).tolist(), round(float(state.total_energy[0]) * 1e6, 3)
+        ([[4.5, 4.5, 9.0, 18.0]], 36.0)
+    """
+
+    def __init__(self, kind: str, *parts):
+        if kind not in ('series', 'parallel'):
+            raise ValueError(f"kind must be 'series' or 'parallel', got {kind!r}")
+        self.capacitors = []  # the leaves in bank order, Capacitor or farads
+        self._layout = self._add(kind, parts)
+
+    def _add(self, kind, parts):
+        """ (kind, children) with leaves as their index into capacitors, nested groups of the same kind flattened """
+        children = []
+        for part in parts:
+            if isinstance(part, CapacitorBank):
+                layout = self._graft(part._layout, part.capacitors)
+                children.extend(layout[1] if layout[0] == kind else [layout])
+            else:
+                children.append(self._leaf(part))
+        return kind, children
+
+    def _graft(self, layout, capacitors):
+        """ layout of a nested bank, its capacitors appended to this bank's """
+        kind, children = layout
+        return kind, [self._leaf(capacitors[c]) if isinstance(c, int) else self._graft(c, capacitors)
+                      for c in children]
+
+    def _leaf(self, capacitor):
+        self.capacitors.append(capacitor)
+        return len(self.capacitors) - 1
+
+    @property
+    def values(self) -> np.ndarray:
+        """ farads of every capacitor in bank order """
+        return np.array([c.capacitance if isinstance(c, Capacitor) else c for c in self.capacitors], dtype=float)
+
+    @property
+    def farads(self) -> float:
+        return float(self.evaluate()[0])
+
+    def _totals(self, layout, farads, totals):
+        """ total farads of layout for every bank, the totals of every nested group are kept in totals """
+        kind, children = layout
+        parts = [farads[:, c] if isinstance(c, int) else self._totals(c, farads, totals) for c in children]
+        total = sum(parts) if kind == 'parallel' else 1 / sum(1 / p for p in parts)
+        totals[id(layout)] = parts, total
+        return total
+
+    def _split(self, layout, volts, totals, out):
+        kind, children = layout
+        parts, total = totals[id(layout)]
+        charge = total * volts
+        for child, farads in zip(children, parts):
+            v = volts if kind == 'parallel' else charge / farads
+            if isinstance(child, int):
+                out[:, child] = v
+            else:
+                self._split(child, v, totals, out)
+
+    def _farads(self, farads):
+        farads = self.values[np.newaxis, :] if farads is None else np.atleast_2d(np.asarray(farads, dtype=float))
+        if farads.shape[1] != len(self.capacitors):
+            raise ValueError(f'expected {len(self.capacitors)} capacitor values per bank, got {farads.shape[1]}')
+        return farads
+
+    def evaluate(self, farads=None) -> np.ndarray:
+        """ total farads of the bank for each row of a (banks, capacitors) array, the bank's own values by default """
+        return self._totals(self._layout, self._farads(farads), {})
+
+    def split(self, volts, farads=None) -> BankState:
+        """ the bank charged to volts (one per bank or one for all), farads as for evaluate() """
+        farads = self._farads(farads)
+        totals = {}
+        total = self._totals(self._layout, farads, totals)
+        volts = np.broadcast_to(np.asarray(volts, dtype=float), total.shape)
+        out = np.empty(farads.shape)
+        self._split(self._layout, volts, totals, out)
+        charge = farads * out
+        energy = 0.5 * farads * out * out
+        return BankState(total, out, charge, energy, energy.sum(axis=1))
+
+    def charge_curve(self, times, volts, ohms, farads=None) -> BankCurve:
+        """
+        Bank volts and energy charging from empty to volts through ohms, v = V (1 - e^(-t / RC)),
+        every capacitor keeps its share of the bank volts from split()
+        Examples:
+            >>> bank = parallel(1e-6, 1e-6)
+            >>> c = bank.charge_curve([0, 2e-3], volts=10, ohms=1e3)
+            >>> c.volts.round(3).tolist(), (c.energy * 1e6).round(2).tolist()
+            ([[0.0, 6.321]], [[0.0, 39.96]])
+        """
+        return self._curve(times, volts, ohms, farads, charging=True)
+
+    def discharge_curve(self, times, volts, ohms, farads=None) -> BankCurve:
+        """ Bank volts and energy discharging from volts through ohms, v = V e^(-t / RC) """
+        return self._curve(times, volts, ohms, farads, charging=False)
+
+    def _curve(self, times, volts, ohms, farads, charging):
+        total = self.evaluate(farads)[:, np.newaxis]
+        times = np.asarray(times, dtype=float)[np.newaxis, :]
+        volts = np.asarray(volts, dtype=float).reshape(-1, 1)
+        tau = np.asarray(ohms, dtype=float).reshape(-1, 1) * total
+        v = volts * (-np.expm1(-times / tau) if charging else np.exp(-times / tau))
+        return BankCurve(times[0], v, 0.5 * total * v * v)
+
+    def __len__(self):
+        return len(self.capacitors)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._layout[0]}, {len(self)} capacitors)'
+
+
+def series(*parts) -> CapacitorBank:
+    return CapacitorBank('series', *parts)
+
+
+def parallel(*parts) -> CapacitorBank:
+    return CapacitorBank('parallel', *parts)
+
+
+def demo():
+    # two strings of three 2200uF 25V electrolytics in parallel, charged to 60V through 100 ohms
+    bank = parallel(series(2200e-6, 2200e-6, 2200e-6), series(2200e-6, 2200e-6, 2200e-6))
+    state = bank.split(60)
+    print(bank, f'{bank.farads * 1e6:,.1f}μF')
+    print('volts per capacitor', state.volts[0].round(2).tolist())
+    print(f'stored energy {float(state.total_energy[0]):.2f}J')
+    tau = 100 * bank.farads
+    curve = bank.charge_curve([tau * k for k in range(6)], volts=60, ohms=100)
+    for t, v in zip(curve.time, curve.volts[0]):
+        print(f'{t * 1e3:8.1f}ms {v:6.2f}V')
+
+
+if __name__ == '__main__':
+    demo()
@@ -0,0 +1,196 @@
+# Chapter-9/transient.py
+
+"""
+# - Time-domain response of RC, RL and RLC networks to any input waveform (pulse trains, PWM, sine, ...)
+# - simulate_exact: exponential update of first order stages, exact for an input held over each sample
+# - simulate_adaptive: adaptive step integration (scipy solve_ivp) of any linear state-space network
+# - both yield TransientChunk buffers of at most chunk samples so runs of any length stream in fixed memory
+
+"""
+import math
+from itertools import count as _count
+from typing import NamedTuple
+
+import numpy as np
+
+from capacitor import Capacitor
+
+
+class TransientChunk(NamedTuple):
+    time: np.ndarray
+    output: np.ndarray  # one column per output for simulate_adaptive, 1-D for simulate_exact
+
+
+# input waveforms, each takes an array of times and returns the source volts
+
+def step_input(volts: [int | float] = 1.0, delay: [int | float] = 0.0):
+    return lambda t: np.where(t >= delay, float(volts), 0.0)
+
+
+def pulse(high: [int | float] = 1.0, low: [int | float] = 0.0, period: [int | float] = 1e-3,
+          duty: float = 0.5, delay: [int | float] = 0.0):
+    """ square wave that is high for duty * period at the start of every period after delay """
+    return lambda t: np.where((t >= delay) & (np.mod(t - delay, period) < duty * period), float(high), float(low))
+
+
+def pwm(volts: [int | float], frequency: [int | float], duty: float):
+    return pulse(high=volts, low=0.0, period=1 / frequency, duty=duty)
+
+
+def sine(amplitude: [int | float] = 1.0, frequency: [int | float] = 60.0, offset: [int | float] = 0.0,
+         phase: [int | float] = 0.0):
+    """ phase in degrees """
+    return lambda t: offset + amplitude * np.sin(2 * math.pi * frequency * t + math.radians(phase))
+
+
+class RCStage(NamedTuple):
+    """ first order low pass, output is the capacitor volts """
+    ohms: float
+    farads: float
+
+    @classmethod
+    def of(cls, capacitor: Capacitor) -> 'RCStage':
+        """ the stage of a Capacitor charging through its ohms """
+        return cls(capacitor.ohms, capacitor.capacitance)
+
+    @property
+    def time_constant(self):
+        return self.ohms * self.farads
+
+    @property
+    def gain(self):
+        return 1.0
+
+
+class RLStage(NamedTuple):
+    """ series R and L across the source, output is the current in amps """
+    ohms: float
+    henries: float
+
+    @property
+    def time_constant(self):
+        return self.henries / self.ohms
+
+    @property
+    def gain(self):
+        return 1 / self.ohms
+
+
+def _times(step, count, start, chunk):
+    """ sample times of successive chunks, rebuilt from the sample index so long runs do not drift """
+    offsets = np.arange(chunk, dtype=float)
+    for first in _count(0, chunk):
+        if count is not None and first >= count:
+            return
+        n = chunk if count is None else min(chunk, count - first)
+        yield start + (first + offsets[:n]) * step
+
+
+def simulate_exact(stages, source, step: [int | float], count: [int | None] = None, start: [int | float] = 0.0,
+                   initial=None, chunk: int = 1 << 16):
+    """
+    Cascade of buffered first order stages (RCStage, RLStage), each output drives the next stage's input.
+    The source is sampled at the start of every step and held, between samples every stage follows
+    y(t + step) = u * gain + (y(t) - u * gain) * exp(-step / tau) exactly, so any step size is stable.
+    - initial is the starting output of each stage, zeros by default
+    Examples:
+        >>> c = Capacitor(capacitance=.01e-6, ohms=8.2e3)
+        >>> chunks = simulate_exact([RCStage.of(c)], step_input(c.volts), step=10e-6, count=6)
+        >>> np.concatenate([x.output for x in chunks]).round(3).tolist()
+        [0.0, 5.74, 10.822, 15.32, 19.301, 22.826]
+        >>> round(c.charge_time(50e-6), 3)
+        22.826
+    """
+    # scipy is imported by the simulations that use it, importing transient stays cheap
+    from scipy.signal import lfilter
+
+    stages = list(stages)
+    decay = [math.exp(-step / s.time_constant) for s in stages]
+    state = [np.array([float(y)]) for y in ([0.0] * len(stages) if initial is None else initial)]
+    for time in _times(step, count, start, chunk):
+        signal = source(time)
+        for k, (s, a) in enumerate(zip(stages, decay)):
+            # y[n] = a * y[n-1] + (1 - a) * gain * u[n-1], y[0] carried over in the filter state
+            signal, state[k] = lfilter([0.0, (1 - a) * s.gain], [1.0, -a], signal, zi=state[k])
+        yield TransientChunk(time, signal)
+
+
+class StateSpace:
+    """
+    Linear network x' = A x + B u, outputs y = C x + D u, with u the source volts
+    Examples:
+        >>> StateSpace.series_rlc(ohms=100, henries=10e-3, farads=1e-6).outputs
+        ('vc', 'current')
+    """
+
+    def __init__(self, a, b, c, d=None, outputs=None):
+        self.a = np.atleast_2d(np.asarray(a, dtype=float))
+        self.b = np.asarray(b, dtype=float).reshape(-1)
+        self.c = np.atleast_2d(np.asarray(c, dtype=float))
+        self.d = np.zeros(len(self.c)) if d is None else np.asarray(d, dtype=float).reshape(-1)
+        self.outputs = tuple(outputs or (f'y{k}' for k in range(len(self.c))))
+
+    @classmethod
+    def rc(cls, ohms, farads):
+        return cls([[-1 / (ohms * farads)]], [1 / (ohms * farads)], [[1.0]], outputs=('vc',))
+
+    @classmethod
+    def rl(cls, ohms, henries):
+        return cls([[-ohms / henries]], [1 / henries], [[1.0]], outputs=('current',))
+
+    @classmethod
+    def series_rlc(cls, ohms, henries, farads):
+        """ states are capacitor volts and loop current """
+        return cls([[0.0, 1 / farads], [-1 / henries, -ohms / henries]], [0.0, 1 / henries],
+                   [[1.0, 0.0], [0.0, 1.0]], outputs=('vc', 'current'))
+
+    @classmethod
+    def rc_ladder(cls, ohms, farads):
+        """ loaded RC ladder, series ohms[k] into shunt farads[k], outputs are every capacitor's volts """
+        n = len(ohms)
+        a = np.zeros((n, n))
+        for k in range(n):
+            a[k, k] -= 1 / (ohms[k] * farads[k])
+            if k > 0:
+                a[k, k - 1] += 1 / (ohms[k] * farads[k])
+            if k + 1 < n:
+                a[k, k] -= 1 / (ohms[k + 1] * farads[k])
+                a[k, k + 1] += 1 / (ohms[k + 1] * farads[k])
+        b = np.zeros(n)
+        b[0] = 1 / (ohms[0] * farads[0])
+        return cls(a, b, np.eye(n), outputs=tuple(f'vc{k + 1}' for k in range(n)))
+
+
+def simulate_adaptive(network: StateSpace, source, step: [int | float], count: [int | None] = None,
+                      start: [int | float] = 0.0, initial=None, chunk: int = 1 << 16, method: str = 'RK45',
+                      rtol: float = 1e-6, atol: float = 1e-9, max_step: [float | None] = None):
+    """
+    Integrates network with an adaptive step solver and reports it every step seconds.
+    - max_step bounds the internal step, by default step, so edges of pulse inputs are never stepped over
+    - method 'Radau' or 'BDF' suits stiff networks with widely spread time constants
+    Examples:
+        >>> rc = StateSpace.rc(8.2e3, .01e-6)
+        >>> out = next(simulate_adaptive(rc, step_input(50), step=10e-6, count=6))
+        >>> out.output[:, 0].round(2).tolist()
+        [0.0, 5.74, 10.82, 15.32, 19.3, 22.83]
+    """
+    from scipy.integrate import solve_ivp
+
+    x = np.zeros(len(network.a)) if initial is None else np.asarray(initial, dtype=float)
+
+    def derivative(t, state):
+        return network.a @ state + network.b * source(np.asarray(t))
+
+    t = start
+    for time in _times(step, count, start, chunk):
+        if time[-1] > t:
+            # integrate on from where the last chunk ended, x is the state at t
+            solution = solve_ivp(derivative, (t, time[-1]), x, method=method, t_eval=time,
+                                 rtol=rtol, atol=atol, max_step=max_step or step)
+            if not solution.success:
+                raise ArithmeticError(f'integration failed after t={t}: {solution.message}')
+            states = solution.y
+        else:
+            states = x[:, np.newaxis]
+        t, x = time[-1], states[:, -1]
+        yield TransientChunk(time, (network.c @ states).T + np.outer(source(time), network.d))
@@ -1,11 +1,36 @@
+import math
+import os
+import sys
+from typing import NamedTuple
+
+import numpy as np
+
+# modules of other chapter directories are read through the electronic_fundamentals package in the project root
+if (_root := os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) not in sys.path:
+    sys.path.append(_root)
+
 DEGREE_SYMBOL = "\u00B0"
 MU_SYMBOL = "\u03BC"
 THETA_SYMBOL = "\u03B8"
 
+# charging pulses per cycle of the line frequency
+RECTIFIERS = {'half-wave': 1, 'full-wave': 2, 'bridge': 2}
+
+
+class RippleDesign(NamedTuple):
+    """ Results of PowerSupply.sweep, arrays with the broadcast shape of its inputs """
+    farads: np.ndarray  # capacitance needed for the ripple target
+    standard_farads: np.ndarray  # smallest E-series capacitor that meets it, nan when none does
+    ripple: np.ndarray  # ripple with the standard capacitor, same measure as calc_ripple
+    ripple_rms: np.ndarray  # rms of the sawtooth ripple voltage
+    ripple_current: np.ndarray  # rms current through the capacitor, nan unless the peak volts are given
+
 
 class PowerSupply:
-    def __init__(self, frequency: [int | float] = 50, current: [int, float] = 1, mfd: [float | int] = 0.0):
-        self._frequency = frequency * 4
+    def __init__(self, frequency: [int | float] = 50, current: [int, float] = 1, mfd: [float | int] = 0.0,
+                 rectifier: str = 'full-wave'):
+        self._line_frequency = frequency
+        self._frequency = frequency * 2 * RECTIFIERS[rectifier]
         self._current = current
         self._ripple = 0
         self._capacitance = mfd
@@ -19,17 +44,75 @@ class PowerSupply:
         self._ripple = self._current / (self._frequency * pcapacitance)
         return self._ripple
 
+    @staticmethod
+    def sweep(frequency, current, ripple, rectifier='full-wave', volts=None, series: str = 'E12') -> RippleDesign:
+        """
+        calc_mfd and calc_ripple over a whole design space in one vectorized pass, inputs broadcast against
+        each other, e.g. np.ix_ grids or equal length arrays
+        - rectifier is a name from RECTIFIERS or an array of names
+        - volts is the peak rectified voltage, needed only for the capacitor ripple current
+        - series is the E-series the capacitor is rounded up to
+        Examples:
+            >>> d = PowerSupply.sweep(frequency=60, current=7, ripple=[.02, 1.2], rectifier='full-wave')
+            >>> d.farads.round(4).tolist(), d.standard_farads.tolist()
+            ([1.4583, 0.0243], [nan, 0.027])
+            >>> PowerSupply.sweep(60, 1, 1.2, rectifier=['half-wave', 'bridge']).farads.round(5).tolist()
+            [0.00694, 0.00347]
+            >>> round(float(PowerSupply.sweep(60, 1, 0.5, volts=17).ripple_current), 2)
+            3.0
+        """
+        from electronic_fundamentals import eseries
+
+        pulses = np.vectorize(RECTIFIERS.__getitem__, otypes=[float])(rectifier)
+        frequency, current, ripple, pulses = np.broadcast_arrays(
+            np.asarray(frequency, dtype=float), np.asarray(current, dtype=float), np.asarray(ripple, dtype=float),
+            pulses)
+        ripple_frequency = frequency * 2 * pulses
+        farads = current / (ripple_frequency * ripple)
+        standard = eseries.ESeriesIndex(series, decades=range(-12, 0)).at_least(farads)
+        actual = current / (ripple_frequency * standard)
+        # the ripple is a sawtooth of 2 * actual volts peak to peak
+        ripple_rms = actual / math.sqrt(3)
+        if volts is None:
+            ripple_current = np.full(farads.shape, np.nan)
+        else:
+            # the diodes recharge the capacitor in one pulse, conduction seconds long, every ripple period
+            with np.errstate(invalid='ignore'):
+                conduction = np.arccos(1 - 2 * actual / np.asarray(volts, dtype=float)) / (2 * math.pi * frequency)
+                ripple_current = current * np.sqrt(1 / (frequency * pulses * conduction) - 1)
+        return RippleDesign(farads, standard, actual, ripple_rms, ripple_current)
+
+    @staticmethod
+    def pareto_front(farads, ripple) -> np.ndarray:
+        """
+        indexes of the designs no other design beats on both capacitance and ripple, by increasing capacitance
+        Examples:
+            >>> PowerSupply.pareto_front([1, 2, 2, 3, 4], [5, 3, 4, 3, 1]).tolist()
+            [0, 1, 4]
+        """
+        farads = np.ravel(farads)
+        ripple = np.ravel(ripple)
+        order = np.lexsort((ripple, farads))
+        ripple = ripple[order]
+        best_before = np.minimum.accumulate(np.concatenate([[np.inf], ripple[:-1]]))
+        return order[ripple < best_before]
+
     def __repr__(self):
-        return f'frequency={self._frequency / 4}Hz / %Vr = {self._ripple:0.02f} / {self._capacitance:.02}{MU_SYMBOL}Fd I={self._current}'
+        return f'frequency={self._line_frequency}Hz / %Vr = {self._ripple:0.02f} / {self._capacitance:.02}{MU_SYMBOL}Fd I={self._current}'
+
+
+def demo():
+    psu = PowerSupply()
 
+    print(f'C = {psu.calc_mfd(voltage_ripple=1.2):.2}{MU_SYMBOL}Fd')
 
-psu = PowerSupply()
+    print(f'%Vr = {psu.calc_ripple(pcapacitance=.0042):.2}')
 
-print(f'C = {psu.calc_mfd(voltage_ripple=1.2):.2}{MU_SYMBOL}Fd')
+    psu1 = PowerSupply(frequency=60, current=7)
+    psu1.calc_mfd(voltage_ripple=.02)
+    # psu1.mfd(voltage_ripple=1)
+    print(psu1)
 
-print(f'%Vr = {psu.calc_ripple(pcapacitance=.0042):.2}')
 
-psu1 = PowerSupply(frequency=60, current=7)
-psu1.calc_mfd(voltage_ripple=.02)
-# psu1.mfd(voltage_ripple=1)
-print(psu1)
+if __name__ == '__main__':
+    demo()
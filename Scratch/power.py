@@ -11,9 +11,14 @@ class CumulativePowerFactory:
         return power
 
 
-x1 = CumulativePowerFactory()
-print(x1(21))
-print(x1(42))
-print(x1.total)
-x3 = CumulativePowerFactory(exponent=2, start=3)
-print(x3(3))
+def demo():
+    x1 = CumulativePowerFactory()
+    print(x1(21))
+    print(x1(42))
+    print(x1.total)
+    x3 = CumulativePowerFactory(exponent=2, start=3)
+    print(x3(3))
+
+
+if __name__ == '__main__':
+    demo()
@@ -1,6 +1,6 @@
 from math import exp
+from collections import Counter
 from functools import singledispatchmethod
-from series import Series
 from fractions import Fraction
 import math
 
@@ -9,59 +9,114 @@ MU = '\u03BC'
 THETA = '\u03B8'
 
 
-class ParallelResistorFactory:
-    def __init__(self, ohms: [int | float | list] = 0):
-        self._ohms = ohms
-        self._resistors = list()
-        self._total_resistance = Series(ohms)
-
-    def __call__(self, base):
-        self._resistors.append(base)
-        total = 0
-        for r in self._resistors:
-            total += r ** -1
-        self._total_resistance = 1 / total
-
-        return self._total_resistance
+class _ReciprocalSum:
+    """
+    Running 1/x sum kept with Neumaier compensation, shared by the parallel resistor and
+    series capacitor factories so adding, removing or replacing one part is O(1)
+    """
+
+    def __init__(self, values: [int | float | list] = 0):
+        self._values = Counter()
+        self._sum = 0.0
+        self._compensation = 0.0
+        if isinstance(values, list):
+            self.extend(values)
+        elif values:
+            self.add(values)
+
+    def _accumulate(self, x):
+        total = self._sum + x
+        if abs(self._sum) >= abs(x):
+            self._compensation += (self._sum - total) + x
+        else:
+            self._compensation += (x - total) + self._sum
+        self._sum = total
+
+    def add(self, value):
+        self._accumulate(value ** -1)
+        self._values[value] += 1
+        return self.total
+
+    def extend(self, values):
+        """ add every value of an iterable, the batch is summed exactly with math.fsum first """
+        values = list(values)
+        self._accumulate(math.fsum(v ** -1 for v in values))
+        self._values.update(values)
+        return self.total
+
+    def remove(self, value):
+        if not self._values[value]:
+            raise ValueError(f'{value} is not in {self.__class__.__name__}')
+        self._values[value] -= 1
+        if not self._values[value]:
+            del self._values[value]
+        if self._values:
+            self._accumulate(-(value ** -1))
+        else:
+            self._sum = self._compensation = 0.0
+        return self.total
+
+    def replace(self, old, new):
+        self.remove(old)
+        return self.add(new)
 
     @property
-    def resistors(self):
-        return self._resistors
+    def values(self):
+        return list(self._values.elements())
 
     @property
     def total(self):
-        return self._total_resistance.value
+        reciprocal = self._sum + self._compensation
+        return 1 / reciprocal if reciprocal else 0
+
+
+class ParallelResistorFactory(_ReciprocalSum):
+    """
+    Total resistance of a growing bank of parallel resistors, 1/Rt = 1/R1 + 1/R2 + ...
+    Examples:
+        >>> bank = ParallelResistorFactory(100)
+        >>> bank(100)
+        50.0
+        >>> bank.extend([200, 200])
+        33.333333333333336
+        >>> bank.replace(200, 100)
+        28.57142857142857
+        >>> bank.remove(100)
+        40.0
+        >>> bank.resistors
+        [100, 100, 200]
+    """
+
+    def __call__(self, base):
+        return self.add(base)
+
+    @property
+    def resistors(self):
+        return self.values
 
     def __repr__(self):
         return (f"{self.__class__.__name__}(" \
-                f'{self._total_resistance} \u03A9)')
+                f'{self.total} \u03A9)')
 
 
-class SeriesCapacitorFactory:
-    def __init__(self, farads: [int | float] = 0):
-        self._total = 0
-        self._farads = farads
-        self._capacitors = Series(farads)
+class SeriesCapacitorFactory(_ReciprocalSum):
+    """
+    Total capacitance of a growing string of series capacitors, 1/Ct = 1/C1 + 1/C2 + ...
+    Examples:
+        >>> string = SeriesCapacitorFactory()
+        >>> string.extend([.01e-6, .01e-6])
+        5e-09
+    """
 
     def __call__(self, base):
-        self._capacitors.append(base)
-        total = 0
-        for c in self._capacitors:
-            total += c ** -1
-        self._total = 1 / total
-
-        return self._total
+        return self.add(base)
 
     @property
     def capacitors(self):
-        return self._capacitors
-
-    @property
-    def total(self):
-        return self._total
+        return self.values
 
     def __repr__(self):
-        return f'{self._total} {MU}F'
+        return f'{self.total} {MU}F'
 
 
 class CapacitiveReactance:
@@ -164,46 +219,51 @@ class Impedance:
 # print(z)
 # print(ParallelResistorFactory(100))
 # print(ParallelResistorFactory.from_list([100, 100]))
-y = ParallelResistorFactory(100)
-
-print(y.total)
-y(200)
-print(y)
-y(200)
-print(y)
-x = ParallelResistorFactory([100, 100, 100, 400, 4.5])
-
-print(f'x={Fraction(x.total)}')
-x = CapacitiveReactance(farads=4700e-6, frequency=120)
-
-print(f'{x.Xc:,} {OMEGA}')
-
-x = CapacitiveReactance()
-print(x.frequency(10e6))
-
-ex915 = CapacitiveReactance(farads=.0056e-6, frequency=10e3)
-print(ex915.Xc)
-print(f'I = {ex915.I(voltage=5)} Amps')
-
-example_10_1 = ImpedanceTriangle()
-print(example_10_1)
-
-i = ImpedanceTriangle(xc=50e3, resistance=33e3)
-print(i)
-example_10_2 = CapacitiveReactance(farads=.01e-6, frequency=1e3)
-xc = example_10_2.Xc
-print(example_10_2)
-t = ImpedanceTriangle(xc=xc, resistance=10e3)
-print(t)
-print("Related Problem")
-example_10_2 = CapacitiveReactance(farads=.01e-6, frequency=2e3)
-xc = example_10_2.Xc
-print(example_10_2)
-t = ImpedanceTriangle(xc=xc, resistance=10e3)
-t.current = 200e-6
-print(t)
-print("Example 10-3")
-example_10_3 = CapacitiveReactance(farads=022e-6, frequency=1.5e3)
-print(example_10_3)
-z = Impedance(xc=example_10_3.Xc, ohms=2.2e3)
-print(z)
\ No newline at end of file
+def demo():
+    y = ParallelResistorFactory(100)
+
+    print(y.total)
+    y(200)
+    print(y)
+    y(200)
+    print(y)
+    x = ParallelResistorFactory([100, 100, 100, 400, 4.5])
+
+    print(f'x={Fraction(x.total)}')
+    x = CapacitiveReactance(farads=4700e-6, frequency=120)
+
+    print(f'{x.Xc:,} {OMEGA}')
+
+    x = CapacitiveReactance()
+    print(x.frequency(10e6))
+
+    ex915 = CapacitiveReactance(farads=.0056e-6, frequency=10e3)
+    print(ex915.Xc)
+    print(f'I = {ex915.I(voltage=5)} Amps')
+
+    example_10_1 = ImpedanceTriangle()
+    print(example_10_1)
+
+    i = ImpedanceTriangle(xc=50e3, resistance=33e3)
+    print(i)
+    example_10_2 = CapacitiveReactance(farads=.01e-6, frequency=1e3)
+    xc = example_10_2.Xc
+    print(example_10_2)
+    t = ImpedanceTriangle(xc=xc, resistance=10e3)
+    print(t)
+    print("Related Problem")
+    example_10_2 = CapacitiveReactance(farads=.01e-6, frequency=2e3)
+    xc = example_10_2.Xc
+    print(example_10_2)
+    t = ImpedanceTriangle(xc=xc, resistance=10e3)
+    t.current = 200e-6
+    print(t)
+    print("Example 10-3")
+    example_10_3 = CapacitiveReactance(farads=022e-6, frequency=1.5e3)
+    print(example_10_3)
+    z = Impedance(xc=example_10_3.Xc, ohms=2.2e3)
+    print(z)
+
+
+if __name__ == '__main__':
+    demo()
@@ -41,7 +41,11 @@ def continued_fraction(number):
             break
 
 
-print(list(continued_fraction(42)))
+def demo():
+    print(list(continued_fraction(42)))
 
-print(list(continued_fraction(Fraction(3,4))))
+    print(list(continued_fraction(Fraction(3,4))))
 
+
+if __name__ == '__main__':
+    demo()
@@ -0,0 +1,465 @@
+# benchmarks.py
+
+"""
+# - Benchmarks that span more than one chapter directory
+# - run with python benchmarks.py from the project root
+# - python benchmarks.py importtime only checks import cost and exits 1 on a regression
+# - python benchmarks.py suite [--save results.json] times fixed workloads of every calculation module at
+#   several sizes, python benchmarks.py compare base.json new.json [--threshold 0.25] exits 1 when the median
+#   of a workload, or the median change of the whole suite, got slower than base by more than the threshold
+# - compare --calibrate divides out the change of a calibration workload that runs no project code, the speed
+#   of the machine between the two runs
+
+"""
+import argparse
+import datetime
+import functools
+import importlib.util
+import io
+import json
+import math
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import electronic_fundamentals
+from electronic_fundamentals import (capacitor, component_table, design, dogbone_colorcodes, exact, impedance,
+                                     montecarlo, netlist, profiling, resistor, sensitivity)
+
+ROOT = electronic_fundamentals.ROOT
+Resistor = resistor.Resistor
+Capacitor = capacitor.Capacitor
+ResistorTable, CapacitorTable = component_table.ResistorTable, component_table.CapacitorTable
+get_color_codes = dogbone_colorcodes.get_color_codes
+encode_many, encode_inventory = dogbone_colorcodes.encode_many, dogbone_colorcodes.encode_inventory
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def _allocated(build):
+    """ bytes allocated by build() and still alive when it returns """
+    tracemalloc.start()
+    kept = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def bench_component_memory(n=10 ** 5):
+    """
+    Prints bytes per component for the object classes against the columnar tables
+    """
+    values = [float(v) for v in range(1, n + 1)]
+    results = {
+        'Resistor': _allocated(lambda: [Resistor(v, name='R') for v in values]),
+        'ResistorTable': _allocated(lambda: ResistorTable((v, 0.05, 0.25) for v in values)),
+        'Capacitor': _allocated(lambda: [Capacitor(v * 1e-9, 10e3, 50.0) for v in values]),
+        'CapacitorTable': _allocated(lambda: CapacitorTable((v * 1e-9, 0.1, 63, 10e3, 50.0) for v in values)),
+    }
+    for name, size in results.items():
+        print(f'{name:15} {size / n:8.1f} bytes per component (n={n:,})')
+
+
+def bench_color_codes(n=10 ** 6, scalar_limit=10 ** 5, seed=0):
+    """
+    Prints the time to encode n values one at a time, as one array and as a CSV stream
+    """
+    values = np.random.default_rng(seed).integers(10, 10 ** 7, size=n).astype(float)
+    m = min(n, scalar_limit)
+    start = time.perf_counter()
+    [get_color_codes(v) for v in values[:m].tolist()]
+    scalar = (time.perf_counter() - start) * n / m
+    start = time.perf_counter()
+    encode_many(values)
+    vector = time.perf_counter() - start
+    stream = io.StringIO('\n'.join(map(str, values.tolist())))
+    start = time.perf_counter()
+    encode_inventory(stream, io.StringIO())
+    csv_stream = time.perf_counter() - start
+    print(f'color codes n={n:,} get_color_codes={scalar:.3f}s encode_many={vector:.3f}s '
+          f'encode_inventory={csv_stream:.3f}s')
+
+
+def bench_ripple_sweep(currents=100, ripples=1111):
+    """
+    Prints the time to size the filter capacitor over a line frequency x rectifier x current x ripple grid
+    (3 x 3 x 100 x 1111, about 10^6 designs) and to take its Pareto front
+    """
+    frequency, rectifier, current, ripple = np.ix_([50.0, 60.0, 400.0], list(design.RECTIFIERS),
+                                                   np.linspace(0.1, 10, currents), np.geomspace(0.01, 2, ripples))
+    start = time.perf_counter()
+    result = design.PowerSupply.sweep(frequency, current, ripple, rectifier, volts=17)
+    sweep = time.perf_counter() - start
+    start = time.perf_counter()
+    front = design.PowerSupply.pareto_front(result.standard_farads, result.ripple)
+    pareto = time.perf_counter() - start
+    print(f'ripple sweep {result.farads.size:,} designs sweep={sweep:.3f}s pareto={pareto:.3f}s '
+          f'({len(front)} on the front)')
+
+
+def bench_montecarlo(trials=4 * 10 ** 6, max_processes=None):
+    """
+    Prints trials per second of a 5 resistor series network from 1 process up to max_processes
+    (os.cpu_count() by default), the samples are identical at every process count
+    """
+    circuit = resistor.Series([Resistor(v, name=f'R{k}') for k, v in enumerate((33, 68, 100, 47, 10))], 10, name='S')
+    base = None
+    for processes in range(1, (max_processes or os.cpu_count() or 1) + 1):
+        start = time.perf_counter()
+        montecarlo.MonteCarlo(trials, seed=0, processes=processes).series(circuit)
+        elapsed = time.perf_counter() - start
+        base = base or elapsed
+        print(f'monte carlo {trials:,} trials processes={processes:<3} {trials / elapsed:14,.0f} trials/s '
+              f'speedup={base / elapsed:.2f}')
+
+
+def bench_netlist(circuits=10 ** 5, seed=0):
+    """
+    Writes circuits 5 resistor series circuits to a temporary netlist and prints circuits parsed per second
+    reading it line by line and through mmap
+    """
+    ohms = np.random.default_rng(seed).integers(10, 10 ** 6, size=(circuits, 5)).tolist()
+    series = (resistor.Series([Resistor(v, name=f'R{k}') for k, v in enumerate(row)], 10, name=f'S{n}')
+              for n, row in enumerate(ohms))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.cir')
+        with open(path, 'w', encoding='utf-8') as out:
+            start = time.perf_counter()
+            netlist.write_circuits(series, out)
+            written = time.perf_counter() - start
+        size = os.path.getsize(path)
+        print(f'netlist {circuits:,} circuits {size / 2 ** 20:.1f} MiB write {circuits / written:12,.0f} circuits/s')
+        for name, read in (('read', netlist.read_circuits), ('mmap', netlist.read_circuits_mmap)):
+            start = time.perf_counter()
+            count = sum(1 for _ in read(path))
+            elapsed = time.perf_counter() - start
+            print(f'netlist {count:,} circuits {name:5} {count / elapsed:12,.0f} circuits/s '
+                  f'{size / elapsed / 2 ** 20:8.1f} MiB/s')
+
+
+def bench_sensitivity(rungs=100, seed=0):
+    """
+    Prints the time for every partial of a ladder's input resistance, one dual number evaluation against
+    central finite differences (two float evaluations per part), and the largest difference between them
+    """
+    rng = np.random.default_rng(seed)
+    series_ohms, shunt_ohms = rng.uniform(10, 1e4, rungs).tolist(), rng.uniform(10, 1e4, rungs).tolist()
+    values = series_ohms + shunt_ohms
+
+    start = time.perf_counter()
+    partials = sensitivity.ladder(series_ohms, shunt_ohms, tolerance=None)
+    dual = time.perf_counter() - start
+
+    start = time.perf_counter()
+    gradient = np.empty(len(values))
+    for k, value in enumerate(values):
+        h = value * 1e-6
+        up, down = list(values), list(values)
+        up[k], down[k] = value + h, value - h
+        gradient[k] = (exact.ladder(up[:rungs], up[rungs:], backend='float')
+                       - exact.ladder(down[:rungs], down[rungs:], backend='float')) / (2 * h)
+    finite = time.perf_counter() - start
+    error = np.max(np.abs(gradient - partials.gradient))
+    print(f'sensitivity ladder {rungs} rungs {len(values)} partials dual={dual * 1e3:.2f}ms '
+          f'finite differences={finite * 1e3:.2f}ms ({finite / dual:.1f}x) max difference={error:.1e}')
+
+
+def _hot_paths(n):
+    """ n reads of a series circuit, a capacitor and an impedance triangle, seconds taken """
+    s = resistor.Series([Resistor(v, name=f'R{k}') for k, v in enumerate((33, 68, 100))], 10, name='S')
+    c = Capacitor(capacitance=2.2e-6, ohms=2.2e3, volts=10)
+    t = impedance.ImpedanceTriangle(2.2e3, 4.8e3, name='t')
+    start = time.perf_counter()
+    for _ in range(n):
+        s.rt, s.voltage_drops, c.charge_time(1e-3), t.z
+    return time.perf_counter() - start
+
+
+def bench_profiling(n=10 ** 5, repeats=9):
+    """
+    Prints the cost of the hot path workload before profiling is ever enabled, while it is enabled and after it
+    is disabled again, disabled must match the baseline, then the busiest counters
+    """
+    baseline = min(_hot_paths(n) for _ in range(repeats))
+    with profiling.profiled():
+        instrumented = min(_hot_paths(n) for _ in range(repeats))
+    disabled = min(_hot_paths(n) for _ in range(repeats))
+    print(f'profiling {n:,} workloads baseline={baseline:.3f}s enabled={instrumented:.3f}s '
+          f'({instrumented / baseline - 1:+.0%}) disabled={disabled:.3f}s ({disabled / baseline - 1:+.1%})')
+    busiest = sorted(profiling.snapshot().items(), key=lambda item: item[1]['seconds'], reverse=True)
+    for key, counts in busiest[:5]:
+        hits = f' cache hits={counts["cache_hits"]:,}' if 'cache_hits' in counts else ''
+        print(f'    {key:40} calls={counts["calls"]:<10,} {counts["seconds"]:.3f}s{hits}')
+
+
+SUITE_ROUNDS = 7
+SUITE_ROUND_SECONDS = 0.05  # a round repeats its workload for at least this long, short ones drown in timer noise
+SUITE_THRESHOLD = 0.25
+CALIBRATION = 'calibration'  # workload of the suite that runs no project code, always timed
+
+
+def _load(directory, name):
+    """ a module by file name from a project directory, 6-6.py and scratch_17.py are not importable by path """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, directory, f'{name}.py'))
+    module = sys.modules[name] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _suite_workloads(seed=0):
+    """
+    {name: (sizes, setup)}, setup(size) builds the inputs and returns the function timed, one call is one round
+    - the per-object workloads construct their objects inside the round, as a caller would
+    """
+    rng = np.random.default_rng(seed)
+    helpers = _load('Chapter-6', '6-6').Resistor
+    reactance_class = _load('Scratch', 'scratch_17').CapacitiveReactance
+
+    def ohms(size, width=5):
+        return rng.integers(10, 10 ** 6, size=(size, width)).astype(float)
+
+    def series(size):
+        rows = [[Resistor(v, name=f'R{k}') for k, v in enumerate(row)] for row in ohms(size).tolist()]
+        return lambda: [resistor.Series(row, 10, name='S').voltage_drops for row in rows]
+
+    def parallel(size):
+        rows = [[Resistor(v, name=f'R{k}') for k, v in enumerate(row)] for row in ohms(size).tolist()]
+        return lambda: [resistor.Parallel(row, 10, name='P').rt() for row in rows]
+
+    def batch(method):
+        return lambda size: functools.partial(method, ohms(size), 10)
+
+    def static_helpers(size):
+        values = ohms(size, 8)
+        return lambda: (helpers.series(values), helpers.parallel(values))
+
+    def charge(size):
+        times = rng.uniform(0, 1e-2, size).tolist()
+        c = Capacitor(capacitance=2.2e-6, ohms=2.2e3, volts=10)
+        return lambda: [(c.charge_time(t), c.discharge_time(t)) for t in times]
+
+    def triangle(size):
+        resistors, frequencies = rng.uniform(100, 1e5, size).tolist(), rng.uniform(10, 1e5, size).tolist()
+
+        def run():
+            for r, f in zip(resistors, frequencies):
+                t = impedance.ImpedanceTriangle(r, name='t')
+                t.calculate_xc(f, 0.022e-6)
+                t.z, t.phase_angle
+        return run
+
+    def reactance(size):
+        # xc = 1 / (2 pi f C) of one triangle retuned to every frequency
+        frequencies = rng.uniform(10, 1e5, size).tolist()
+        t = impedance.ImpedanceTriangle(2.2e3, name='t')
+        return lambda: [t.calculate_xc(f, 0.022e-6) for f in frequencies]
+
+    def capacitive_reactance(size):
+        farads, frequencies = rng.uniform(1e-9, 1e-6, size).tolist(), rng.uniform(10, 1e5, size).tolist()
+        return lambda: [reactance_class(c, f).Xc for c, f in zip(farads, frequencies)]
+
+    def calc_mfd(size):
+        ripples = rng.uniform(0.1, 2, size).tolist()
+        supply = design.PowerSupply(frequency=60, current=1.5)
+        return lambda: [supply.calc_mfd(r) for r in ripples]
+
+    def color_codes(size):
+        values = rng.integers(10, 10 ** 7, size).astype(float).tolist()
+        return lambda: [get_color_codes(v) for v in values]
+
+    def calibration(size):
+        # interpreter and NumPy work of the same mix as the workloads, changes of the project do not move it
+        values = rng.uniform(1, 1e6, size)
+        numbers = values.tolist()
+        return lambda: (np.sort(values), [math.log10(v) * 2 + v % 7 for v in numbers])
+
+    return {
+        CALIBRATION: ((10 ** 4,), calibration),
+        'Series.voltage_drops': ((100, 10 ** 4), series),
+        'Series.batch': ((10 ** 3, 10 ** 5, 10 ** 6), batch(resistor.Series.batch)),
+        'Parallel.rt': ((100, 10 ** 4), parallel),
+        'Parallel.batch': ((10 ** 3, 10 ** 5, 10 ** 6), batch(resistor.Parallel.batch)),
+        '6-6 Resistor.series/parallel': ((10 ** 3, 10 ** 5, 10 ** 6), static_helpers),
+        'Capacitor.charge_time/discharge_time': ((100, 10 ** 4), charge),
+        'ImpedanceTriangle': ((100, 10 ** 4), triangle),
+        'ImpedanceTriangle.calculate_xc': ((100, 10 ** 4), reactance),
+        'CapacitiveReactance.Xc': ((100, 10 ** 4), capacitive_reactance),
+        'PowerSupply.calc_mfd': ((100, 10 ** 4), calc_mfd),
+        'get_color_codes': ((100, 10 ** 4), color_codes),
+    }
+
+
+def _round(run, number):
+    """ seconds per call of number calls of run """
+    start = time.perf_counter()
+    for _ in range(number):
+        run()
+    return (time.perf_counter() - start) / number
+
+
+def run_suite(rounds=SUITE_ROUNDS, names=None) -> dict:
+    """
+    Times every workload of the suite at each of its sizes, rounds times, and prints a line per workload size,
+    returns the results in the form saved as JSON, times are seconds per call of the workload
+    - the rounds are interleaved, round k of every workload runs before round k + 1 of any, so a slow spell of
+      the machine lands on one round of many workloads instead of every round of one, the median drops it
+    """
+    runs = {}
+    for name, (sizes, setup) in _suite_workloads().items():
+        if names and name not in names and name != CALIBRATION:
+            continue
+        for size in sizes:
+            run = setup(size)
+            number = max(1, math.ceil(SUITE_ROUND_SECONDS / max(_timed(run), 1e-9)))
+            runs[f'{name}[{size}]'] = (name, size, run, number, [])
+    for _ in range(rounds):
+        for name, size, run, number, times in runs.values():
+            times.append(_round(run, number))
+    benchmarks = {}
+    for key, (name, size, run, number, times) in runs.items():
+        benchmarks[key] = {'name': name, 'size': size, 'rounds': rounds, 'number': number, 'times': times,
+                           'min': min(times), 'median': statistics.median(times), 'mean': statistics.fmean(times)}
+        print(f'{key:45} min={min(times) * 1e3:10.3f}ms median={statistics.median(times) * 1e3:10.3f}ms '
+              f'{size / statistics.median(times):14,.0f} per s')
+    return {'datetime': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'machine': {'python': platform.python_version(), 'numpy': np.__version__,
+                        'platform': platform.platform(), 'processor': platform.machine()},
+            'benchmarks': benchmarks}
+
+
+def compare(base: dict, new: dict, threshold: float = SUITE_THRESHOLD, calibrate: bool = False) -> list:
+    """
+    Prints the change of the median of every workload in both results, returns the workloads slower than base
+    by more than threshold (0.25 is 25%), and 'whole suite' when the median change of all of them is
+    - calibrate divides every change by the change of the calibration workload, for results from machines
+      or runs of a different speed, a slowdown shared by every workload still shows in the whole suite line
+    """
+    common = [key for key in base['benchmarks'] if key in new['benchmarks']]
+    for key in base['benchmarks']:
+        if key not in new['benchmarks']:
+            print(f'{key:45} missing from the new results')
+    ratios = {key: new['benchmarks'][key]['median'] / base['benchmarks'][key]['median'] for key in common}
+    calibration = [key for key in ratios if base['benchmarks'][key]['name'] == CALIBRATION]
+    speed = 1.0
+    if calibrate:
+        if not calibration:
+            raise ValueError(f'calibrate needs the {CALIBRATION} workload in both results')
+        speed = ratios[calibration[0]]
+        print(f'{"machine speed":45} {speed - 1:+8.1%} change of {calibration[0]}, divided out')
+    regressions = []
+    for key in common:
+        if key in calibration:
+            continue
+        change = ratios[key] / speed - 1
+        flag = ''
+        if change > threshold:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        print(f'{key:45} {base["benchmarks"][key]["median"] * 1e3:10.3f}ms -> '
+              f'{new["benchmarks"][key]["median"] * 1e3:10.3f}ms {change:+8.1%}{flag}')
+    changes = [ratios[key] / speed - 1 for key in common if key not in calibration]
+    suite = statistics.median(changes) if changes else 0.0
+    flag = ''
+    if suite > threshold:
+        regressions.append('whole suite')
+        flag = '  REGRESSION'
+    print(f'{"whole suite":45} {suite:+8.1%} median change{flag}')
+    return regressions
+
+
+IMPORT_SELF_BUDGET_MS = 50  # time spent in a module's own body, demo code at import time blows through this
+IMPORT_CUMULATIVE_BUDGET_MS = 250  # with its dependencies, numpy alone is ~100ms here, scipy several hundred
+IMPORT_PACKAGE_BUDGET_MS = 50  # the package imports no submodule until one is used
+
+
+def _import_times(statement):
+    """ {module: (self ms, cumulative ms)} and stdout of python -X importtime -c statement in a fresh interpreter """
+    run = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    times = {}
+    for line in run.stderr.splitlines():
+        if match := re.match(r'import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)', line):
+            times[match[4]] = (int(match[1]) / 1e3, int(match[2]) / 1e3)
+    return times, run.stdout
+
+
+def bench_import_time(modules=tuple(electronic_fundamentals.SUBMODULES)):
+    """
+    Prints import cost of the package and each submodule, returns the list of budget or side effect failures
+    """
+    failures = []
+    times, _ = _import_times('import electronic_fundamentals')
+    package = times['electronic_fundamentals'][1]
+    print(f'{"electronic_fundamentals":20} cumulative={package:8.1f}ms')
+    if package > IMPORT_PACKAGE_BUDGET_MS:
+        failures.append(f'electronic_fundamentals took {package:.1f}ms, budget {IMPORT_PACKAGE_BUDGET_MS}ms')
+    for name in modules:
+        times, stdout = _import_times(f'from electronic_fundamentals import {name}')
+        own, cumulative = times[f'electronic_fundamentals.{name}']
+        print(f'{name:20} self={own:8.1f}ms cumulative={cumulative:8.1f}ms')
+        if own > IMPORT_SELF_BUDGET_MS:
+            failures.append(f'{name} took {own:.1f}ms in its own body, budget {IMPORT_SELF_BUDGET_MS}ms')
+        if cumulative > IMPORT_CUMULATIVE_BUDGET_MS:
+            failures.append(f'{name} took {cumulative:.1f}ms with its imports, budget {IMPORT_CUMULATIVE_BUDGET_MS}ms')
+        if stdout:
+            failures.append(f'{name} printed {len(stdout.splitlines())} lines on import')
+    for failure in failures:
+        print(f'REGRESSION: {failure}')
+    return failures
+
+
+def _arguments():
+    parser = argparse.ArgumentParser(description='benchmarks that span the chapter directories, all by default')
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('importtime', help='check import cost, exit 1 on a regression')
+    suite = commands.add_parser('suite', help='time fixed workloads of every calculation module')
+    suite.add_argument('--save', metavar='PATH', help='write the results as JSON')
+    suite.add_argument('--rounds', type=int, default=SUITE_ROUNDS)
+    suite.add_argument('--only', nargs='+', metavar='NAME', help='workload names to run')
+    check = commands.add_parser('compare', help='exit 1 when new is slower than base beyond the threshold')
+    check.add_argument('base')
+    check.add_argument('new')
+    check.add_argument('--threshold', type=float, default=SUITE_THRESHOLD,
+                       help='allowed slowdown of the median, 0.25 is 25%%')
+    check.add_argument('--calibrate', action='store_true',
+                       help=f'divide out the change of the {CALIBRATION} workload, the speed of the machine')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    arguments = _arguments()
+    if arguments.command == 'importtime':
+        sys.exit(1 if bench_import_time() else 0)
+    if arguments.command == 'suite':
+        results = run_suite(arguments.rounds, arguments.only)
+        if arguments.save:
+            with open(arguments.save, 'w', encoding='utf-8') as out:
+                json.dump(results, out, indent=2)
+        sys.exit(0)
+    if arguments.command == 'compare':
+        with open(arguments.base, encoding='utf-8') as base, open(arguments.new, encoding='utf-8') as new:
+            regressions = compare(json.load(base), json.load(new), arguments.threshold, arguments.calibrate)
+        sys.exit(1 if regressions else 0)
+    bench_component_memory()
+    bench_color_codes()
+    bench_ripple_sweep()
+    bench_montecarlo()
+    bench_netlist()
+    bench_sensitivity()
+    bench_profiling()
+    bench_import_time()
@@ -0,0 +1,187 @@
+# component_table.py
+
+"""
+# - Columnar storage for large bills of material of resistors and capacitors
+# - each column is a contiguous array('d'), rows are read through small __slots__ views
+#   that keep the Resistor (Chapter-6/resistor.py) and Capacitor (Chapter-9/capacitor.py) API
+
+"""
+import math
+from array import array
+
+import numpy as np
+
+MU_SYMBOL = "\u03BC"
+OMEGA_SYMBOL = "\u03A9"
+
+
+class ComponentTable:
+    """ One array('d') per column, one row per component """
+    columns = ('value', 'tolerance', 'rating')
+    defaults = {}  # column: value of a missing trailing column, 0.0 when not listed
+    view = None
+
+    def __init__(self, rows=()):
+        """
+        - rows is an iterable of tuples in column order, missing trailing columns take their defaults
+        """
+        self._columns = {name: array('d') for name in self.columns}
+        self.extend(rows)
+
+    def append(self, *values):
+        if len(values) > len(self.columns):
+            raise ValueError(f'expected at most {len(self.columns)} values {self.columns}, got {values}')
+        values = values + tuple(self.defaults.get(name, 0.0) for name in self.columns[len(values):])
+        for name, value in zip(self.columns, values):
+            self._columns[name].append(value)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(*row)
+
+    def column(self, name) -> np.ndarray:
+        """ NumPy copy of one column, a view of the array('d') would stop append() resizing it while alive """
+        return np.frombuffer(self._columns[name], dtype=np.float64).copy()
+
+    def nbytes(self) -> int:
+        """ bytes held by the column buffers """
+        return sum(c.buffer_info()[1] * c.itemsize for c in self._columns.values())
+
+    def __len__(self):
+        return len(self._columns[self.columns[0]])
+
+    def __getitem__(self, index):
+        """ the row view at index, or a list of them for a slice """
+        if isinstance(index, slice):
+            return [self.view(self._columns, k) for k in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'{self.__class__.__name__} index out of range: {index}')
+        return self.view(self._columns, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.view(self._columns, index)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self):,} rows, {self.nbytes():,} bytes)'
+
+
+class ResistorView:
+    """ One row of a ResistorTable, same calculations as Chapter-6 Resistor """
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    @property
+    def ohms(self):
+        return self._columns['value'][self._index]
+
+    @property
+    def tolerance(self):
+        return self._columns['tolerance'][self._index]
+
+    @property
+    def rating(self):
+        """ power rating in watts """
+        return self._columns['rating'][self._index]
+
+    def current(self, voltage):
+        return round(float(voltage / self.ohms), 2)
+
+    def voltage_drop(self, total_resistance, voltage):
+        return float((self.ohms / total_resistance) * voltage)
+
+    def power(self, voltage):
+        return round(float(self.current(voltage) ** 2 * self.ohms), 2)
+
+    def __repr__(self):
+        return f'{self.ohms:,}{OMEGA_SYMBOL}'
+
+
+class ResistorTable(ComponentTable):
+    """
+    Columns are ohms, tolerance (0.05 for 5%) and power rating in watts
+    Examples:
+        >>> t = ResistorTable([(100, 0.05, 0.25), (47,)])
+        >>> len(t)
+        2
+        >>> t[0].current(25)
+        0.25
+        >>> t[0].power(10)
+        1.0
+        >>> t[-1].ohms
+        47.0
+        >>> t.column('value').sum()
+        147.0
+        >>> t.append(33)
+        >>> [r.ohms for r in t[1:]]
+        [47.0, 33.0]
+    """
+    view = ResistorView
+
+
+class CapacitorView:
+    """ One row of a CapacitorTable, same calculations as Chapter-9 Capacitor """
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    @property
+    def capacitance(self):
+        return self._columns['value'][self._index]
+
+    @property
+    def tolerance(self):
+        return self._columns['tolerance'][self._index]
+
+    @property
+    def rating(self):
+        """ voltage rating in volts """
+        return self._columns['rating'][self._index]
+
+    @property
+    def ohms(self):
+        return self._columns['ohms'][self._index]
+
+    @property
+    def volts(self):
+        return self._columns['volts'][self._index]
+
+    @property
+    def time_constant(self):
+        return self.ohms * self.capacitance
+
+    def discharge_time(self, time: [int | float]):
+        return self.volts * (math.exp(-(time / self.time_constant)))
+
+    def charge_time(self, time: [int | float]):
+        return self.volts * (1 - math.exp(-(time / self.time_constant)))
+
+    def __repr__(self):
+        return f'{self.capacitance}{MU_SYMBOL}F {self.ohms:,}{OMEGA_SYMBOL} tc={self.time_constant:e} seconds'
+
+
+class CapacitorTable(ComponentTable):
+    """
+    Columns are farads, tolerance, voltage rating, the ohms of the resistor it charges through
+    and the source volts
+    Examples:
+        >>> t = CapacitorTable([(2.2e-6, 0.1, 63, 10e3, 50.0)])
+        >>> c = t[0]
+        >>> round(c.time_constant, 6)
+        0.022
+        >>> round(c.charge_time(0.022), 3)
+        31.606
+        >>> t.append(2.2e-6)
+        >>> t[1].ohms, t[1].volts
+        (10000.0, 50.0)
+    """
+    columns = ComponentTable.columns + ('ohms', 'volts')
+    defaults = {'ohms': 10e3, 'volts': 50.0}  # those of Chapter-9 Capacitor
+    view = CapacitorView
@@ -1,4 +1,17 @@
-COLOR_CODES = ["BLACK", "BROWN", "RED", "ORANGE", "YELLOW", "GREEN", "BLUE", "VIOLET", "GRAY", "WHITE"]
+"""
+# - Resistor color bands, table driven in both directions
+# - get_color_codes encodes a value to 4, 5 or 6 bands, decode_color_codes reads them back
+# - encode_many and encode_inventory do the same for whole arrays, lists or CSV streams of values
+
+"""
+import csv
+import itertools
+from typing import NamedTuple
+
+import numpy as np
+
+COLOR_CODES = ["BLACK", "BROWN", "RED", "ORANGE", "YELLOW", "GREEN", "BLUE", "VIOLET", "GRAY", "WHITE",
+               "GOLD", "SILVER"]
 BLACK = 0
 BROWN = 1
 RED = 2
@@ -9,48 +22,190 @@ BLUE = 6
 VIOLET = 7
 GRAY = 8
 WHITE = 9
+GOLD = 10
+SILVER = 11
+
+# multiplier band for 10 ** exponent, exponent -2 (SILVER) to 9 (WHITE)
+MULTIPLIER_COLORS = (SILVER, GOLD, BLACK, BROWN, RED, ORANGE, YELLOW, GREEN, BLUE, VIOLET, GRAY, WHITE)
+MULTIPLIERS = {color: exponent for exponent, color in enumerate(MULTIPLIER_COLORS, start=-2)}
+TOLERANCES = {BROWN: 0.01, RED: 0.02, GREEN: 0.005, BLUE: 0.0025, VIOLET: 0.001, GRAY: 0.0005,
+              GOLD: 0.05, SILVER: 0.10}
+TOLERANCE_COLORS = {tolerance: color for color, tolerance in TOLERANCES.items()}
+NO_BAND_TOLERANCE = 0.20
+# temperature coefficient band of 6 band resistors in ppm/K
+TEMPCOS = {BLACK: 250, BROWN: 100, RED: 50, ORANGE: 15, YELLOW: 25, GREEN: 20, BLUE: 10, VIOLET: 5, GRAY: 1}
+TEMPCO_COLORS = {tempco: color for color, tempco in TEMPCOS.items()}
+SIGNIFICANT_DIGITS = {3: 2, 4: 2, 5: 3, 6: 3}
+
+
+class ColorCode(NamedTuple):
+    ohms: float
+    tolerance: float
+    tempco: [int | None]  # ppm/K, only on 6 band resistors
+
+
+def _band_colors(bands, tolerance, tempco):
+    """ (significant digits, tolerance color, tempco color) for a band count, raises ValueError when not encodable """
+    if bands not in (4, 5, 6):
+        raise ValueError(f'bands must be 4, 5 or 6, got {bands}')
+    if tolerance not in TOLERANCE_COLORS:
+        raise ValueError(f'no tolerance band for {tolerance}, expected one of {sorted(TOLERANCE_COLORS)}')
+    if bands == 6 and tempco not in TEMPCO_COLORS:
+        raise ValueError(f'no temperature coefficient band for {tempco}, expected one of {sorted(TEMPCO_COLORS)}')
+    return SIGNIFICANT_DIGITS[bands], TOLERANCE_COLORS[tolerance], TEMPCO_COLORS.get(tempco)
+
+
+def _scientific(value, digits):
+    """ (mantissa of digits digits, exponent) of value, rounded from its exact binary value """
+    mantissa, exponent = f'{value:.{digits - 1}e}'.split('e')
+    return int(mantissa.replace('.', '')), int(exponent) - (digits - 1)
+
+
+def get_color_codes(value: [float | int], bands: int = 4, tolerance: float = 0.05, tempco: [int | None] = None):
+    """
+    Color bands of a resistor, two significant digits for 4 bands and three for 5 and 6 bands,
+    values with more digits are rounded
+    Examples:
+        >>> get_color_codes(4700)
+        ('YELLOW', 'VIOLET', 'RED', 'GOLD')
+        >>> get_color_codes(4.7)
+        ('YELLOW', 'VIOLET', 'GOLD', 'GOLD')
+        >>> get_color_codes(0.22, tolerance=0.1)
+        ('RED', 'RED', 'SILVER', 'SILVER')
+        >>> get_color_codes(10.2e3, bands=5, tolerance=0.01)
+        ('BROWN', 'BLACK', 'RED', 'RED', 'BROWN')
+        >>> get_color_codes(249, bands=6, tolerance=0.01, tempco=50)
+        ('RED', 'YELLOW', 'WHITE', 'BLACK', 'BROWN', 'RED')
+        >>> get_color_codes(0)
+        Traceback (most recent call last):
+        ...
+        ValueError: resistor values must be greater than 0, got 0
+    """
+    digits, tolerance_color, tempco_color = _band_colors(bands, tolerance, tempco)
+    if not value > 0:
+        raise ValueError(f'resistor values must be greater than 0, got {value}')
+    mantissa, exponent = _scientific(value, digits)
+    if not -2 <= exponent <= 9:
+        raise ValueError(f'{value} ohms is outside the range of the multiplier band')
+    codes = [COLOR_CODES[int(d)] for d in str(mantissa)]
+    codes += [COLOR_CODES[MULTIPLIER_COLORS[exponent + 2]], COLOR_CODES[tolerance_color]]
+    if bands == 6:
+        codes.append(COLOR_CODES[tempco_color])
+    return tuple(codes)
+
+
+def decode_color_codes(bands) -> ColorCode:
+    """
+    Value, tolerance and temperature coefficient of 3 to 6 color bands, names or COLOR_CODES indexes
+    Examples:
+        >>> decode_color_codes(('YELLOW', 'VIOLET', 'RED', 'GOLD'))
+        ColorCode(ohms=4700, tolerance=0.05, tempco=None)
+        >>> decode_color_codes(('RED', 'RED', 'SILVER', 'SILVER'))
+        ColorCode(ohms=0.22, tolerance=0.1, tempco=None)
+        >>> decode_color_codes(get_color_codes(249, bands=6, tolerance=0.01, tempco=50))
+        ColorCode(ohms=249, tolerance=0.01, tempco=50)
+        >>> decode_color_codes(('YELLOW', 'VIOLET', 'RED', 'BLACK'))
+        Traceback (most recent call last):
+        ...
+        ValueError: BLACK is not a tolerance band, expected one of BROWN, RED, GREEN, BLUE, VIOLET, GRAY, GOLD, SILVER
+    """
+    codes = [_code(b) for b in bands]
+    if len(codes) not in SIGNIFICANT_DIGITS:
+        raise ValueError(f'expected 3 to 6 bands, got {len(codes)}')
+    digits = SIGNIFICANT_DIGITS[len(codes)]
+    if any(c > WHITE for c in codes[:digits]):
+        raise ValueError(f'{COLOR_CODES[max(codes[:digits])]} is not a digit band')
+    mantissa = int(''.join(str(c) for c in codes[:digits]))
+    exponent = MULTIPLIERS[codes[digits]]
+    ohms = mantissa * 10 ** exponent if exponent >= 0 else mantissa / 10 ** -exponent
+    tolerance = _band(TOLERANCES, codes[digits + 1], 'tolerance') if len(codes) > 3 else NO_BAND_TOLERANCE
+    tempco = _band(TEMPCOS, codes[digits + 2], 'temperature coefficient') if len(codes) == 6 else None
+    return ColorCode(ohms, tolerance, tempco)
+
+
+def _code(band) -> int:
+    """ COLOR_CODES index of a band name or index """
+    if isinstance(band, int):
+        if not 0 <= band < len(COLOR_CODES):
+            raise ValueError(f'band index must be 0 to {len(COLOR_CODES) - 1}, got {band}')
+        return band
+    if band.upper() not in COLOR_CODES:
+        raise ValueError(f'unknown band color {band!r}, expected one of {", ".join(COLOR_CODES)}')
+    return COLOR_CODES.index(band.upper())
+
+
+def _band(table, code, kind):
+    if code not in table:
+        raise ValueError(f'{COLOR_CODES[code]} is not a {kind} band, '
+                         f'expected one of {", ".join(COLOR_CODES[c] for c in table)}')
+    return table[code]
+
+
+def encode_many(values, bands: int = 4, tolerance: float = 0.05, tempco: [int | None] = None) -> np.ndarray:
+    """
+    get_color_codes for an array of values in one vectorized pass, returns a (len(values), bands) array
+    of COLOR_CODES indexes, names are COLOR_CODES[i]
+    Examples:
+        >>> encode_many([4700, 4.7, 10]).tolist()
+        [[4, 7, 2, 10], [4, 7, 10, 10], [1, 0, 0, 10]]
+        >>> encode_many([0.995]).tolist() == [[COLOR_CODES.index(c) for c in get_color_codes(0.995)]]
+        True
+    """
+    digits, tolerance_color, tempco_color = _band_colors(bands, tolerance, tempco)
+    values = np.asarray(values, dtype=float)
+    if not np.all(values > 0):
+        raise ValueError(f'resistor values must be greater than 0, got {values[~(values > 0)][0]}')
+    exponent = np.floor(np.log10(values)).astype(np.int64) - (digits - 1)
+    scaled = values / 10.0 ** exponent
+    mantissa = np.rint(scaled)
+    # values / 10 ** exponent is itself rounded, near a half way point it can round the other way from the
+    # exact binary value get_color_codes rounds, those few take the scalar path
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-9
+    # log10 can land one off near powers of ten and rounding can carry into another digit
+    carry = mantissa >= 10 ** digits
+    low = mantissa < 10 ** (digits - 1)
+    exponent += carry.astype(np.int64) - low.astype(np.int64)
+    scaled = np.where(carry | low, values / 10.0 ** exponent, scaled)
+    mantissa = np.rint(scaled).astype(np.int64)
+    ties |= np.abs(scaled - np.floor(scaled) - 0.5) < 1e-9
+    for k in np.flatnonzero(ties).tolist():
+        mantissa[k], exponent[k] = _scientific(values[k], digits)
+    if exponent.size and (exponent.min() < -2 or exponent.max() > 9):
+        raise ValueError('values outside the range of the multiplier band')
+    codes = np.empty((len(values), bands), dtype=np.int8)
+    for d in range(digits):
+        codes[:, d] = mantissa // 10 ** (digits - 1 - d) % 10
+    codes[:, digits] = np.asarray(MULTIPLIER_COLORS, dtype=np.int8)[exponent + 2]
+    codes[:, digits + 1] = tolerance_color
+    if bands == 6:
+        codes[:, digits + 2] = tempco_color
+    return codes
+
+
+def encode_inventory(source, out, bands: int = 4, tolerance: float = 0.05, tempco: [int | None] = None,
+                     chunk: int = 65536) -> int:
+    """
+    Reads values from the first column of a CSV stream (or any iterable of values) and writes
+    value,band,band,... rows to out, chunk rows at a time, returns the number of rows written
+    """
+    if isinstance(source, str) or hasattr(source, 'read'):
+        source = source.splitlines() if isinstance(source, str) else source
+        source = (row[0] for row in csv.reader(source) if row and row[0].strip())
+    names = np.array(COLOR_CODES)
+    writer = csv.writer(out)
+    count = 0
+    iterator = iter(source)
+    while batch := list(itertools.islice(iterator, chunk)):
+        codes = encode_many(np.array(batch, dtype=float), bands, tolerance, tempco)
+        writer.writerows(zip(batch, *names[codes].T))
+        count += len(batch)
+    return count
+
+
+def demo():
+    for value in (10, 25, 300, 560, 3000, 5400, 10000, 62000, 200000, 430000, 3000000, 6700000, 18000000, 20000000):
+        print(value, '=', *get_color_codes(value))
 
 
-def get_color_codes(value: [float | int]):
-    print(value, end=' = ')
-    str_value = str(int(value))
-
-    pos = 0
-    # print the first color, used on the body of the resistor
-    print(COLOR_CODES[int(str_value[pos])], end=' ')
-    pos += 1
-    # print the second color
-    #    if int(str_value[pos]) != 0:
-    print(COLOR_CODES[int(str_value[pos])], end=' ')
-    pos += 1
-    if value < 100:
-        print(COLOR_CODES[BLACK], end=' ')
-    elif value < 1000:
-        print(COLOR_CODES[BROWN], end=' ')
-    elif value < 10000:
-        print(COLOR_CODES[RED], end=' ')
-    elif value < 100000:
-        print(COLOR_CODES[ORANGE], end=' ')
-    elif value < 1e6:
-        print(COLOR_CODES[YELLOW], end=' ')
-    elif value < 10000000:
-        print(COLOR_CODES[GREEN], end=' ')
-    elif value < 100000000:
-        print(COLOR_CODES[BLUE], end=' ')
-    print()
-
-
-get_color_codes(10)
-get_color_codes(25)
-get_color_codes(300)
-get_color_codes(560)
-get_color_codes(3000)
-get_color_codes(5400)
-get_color_codes(10000)
-get_color_codes(62000)
-get_color_codes(200000)
-get_color_codes(430000)
-get_color_codes(3000000)
-get_color_codes(6700000)
-get_color_codes(18000000)
-get_color_codes(20000000)
+if __name__ == '__main__':
+    demo()
@@ -0,0 +1,134 @@
+# electronic_fundamentals/__init__.py
+
+"""
+# - Library entry point for the chapter modules, importing the package loads none of them
+# - each submodule is imported the first time it is used, e.g.
+#       from electronic_fundamentals import resistor
+#       electronic_fundamentals.capacitor.Capacitor(...)
+# - each file is loaded from its chapter directory as electronic_fundamentals.<name>, sys.path is left alone so
+#   a same-named module elsewhere on it can neither shadow a chapter module nor be shadowed by one
+# - while a chapter module runs, its plain name imports of files next to it (from resistor import Resistor)
+#   resolve to the package's modules, so each chapter file is loaded once
+# - python -m electronic_fundamentals [module ...] runs the book examples of each module
+# - cache_info() reports hits and misses of the derived value caches of the loaded modules
+
+"""
+import functools
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# submodule name: directory it lives in, relative to the project root
+SUBMODULES = {
+    'resistor': 'Chapter-6',
+    'eseries': 'Chapter-6',
+    'nodal': 'Chapter-6',
+    'exact': 'Chapter-6',
+    'capacitor': 'Chapter-9',
+    'transient': 'Chapter-9',
+    'capacitor_bank': 'Chapter-9',
+    'impedance': 'rc_circuits',
+    'phasor': 'rc_circuits',
+    'rc_filter': 'rc_circuits',
+    'design': 'Power Supply',
+    'component_table': '',
+    'dogbone_colorcodes': '',
+    'montecarlo': '',
+    'netlist': '',
+    'sensitivity': '',
+    'profiling': '',
+}
+
+__all__ = list(SUBMODULES)
+
+
+_loading = []  # directories of the chapter modules running, innermost last
+
+
+@functools.cache
+def _siblings(directory: str) -> frozenset:
+    """ module names of the .py files in a chapter directory """
+    return frozenset(name[:-3] for name in os.listdir(directory) if name.endswith('.py'))
+
+
+class _Loader(importlib.machinery.SourceFileLoader):
+    """ runs a chapter file as electronic_fundamentals.<name>, pointing its sibling imports at the package """
+
+    def exec_module(self, module):
+        directory = os.path.dirname(self.path)
+        siblings = _siblings(directory)
+        # modules already imported under a sibling's plain name are set aside so they are not picked up instead
+        saved = {name: sys.modules.pop(name) for name in siblings if name in sys.modules}
+        _loading.append(directory)
+        try:
+            super().exec_module(module)
+        finally:
+            _loading.pop()
+            for name in siblings - set(saved):
+                if name in sys.modules and sys.modules[name] is sys.modules.get(f'{__name__}.{name}'):
+                    del sys.modules[name]
+            sys.modules.update(saved)
+
+
+class _Sibling:
+    """ loader of a plain name sibling import, gives the module the package loaded """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.spec = None
+
+    def create_module(self, spec):
+        __import__(f'{__name__}.{self.name}')
+        module = sys.modules[f'{__name__}.{self.name}']
+        self.spec = module.__spec__
+        return module
+
+    def exec_module(self, module):
+        module.__spec__ = self.spec  # module_from_spec replaced it with the plain name's spec
+
+
+class _Finder:
+    """ finds electronic_fundamentals.<name> in its chapter directory, and sibling plain names while one runs """
+
+    @staticmethod
+    def find_spec(fullname, path=None, target=None):
+        package, _, name = fullname.rpartition('.')
+        if package == __name__:
+            # a submodule, or a helper file next to the chapter module importing it (my_symbols)
+            directory = os.path.join(ROOT, SUBMODULES[name]) if name in SUBMODULES else _loading and _loading[-1]
+            location = directory and os.path.join(directory, f'{name}.py')
+            if location and os.path.isfile(location):
+                return importlib.util.spec_from_file_location(fullname, location,
+                                                              loader=_Loader(fullname, location))
+        elif not package and _loading and name in _siblings(_loading[-1]):
+            return importlib.util.spec_from_loader(fullname, _Sibling(name))
+        return None
+
+
+# ahead of the path finders, the plain names are only taken over while a chapter module runs
+if not any(type(finder).__name__ == '_Finder' for finder in sys.meta_path):
+    sys.meta_path.insert(0, _Finder())
+
+
+def __getattr__(name):
+    if name not in SUBMODULES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    # __import__ rather than importlib.import_module so python -X importtime reports the module, and a regular
+    # import so pickle finds electronic_fundamentals.<name> again
+    __import__(f'{__name__}.{name}')
+    module = sys.modules[f'{__name__}.{name}']
+    globals()[name] = module
+    return module
+
+
+def cache_info() -> dict:
+    """ {submodule: CacheInfo} of the process wide caches of the submodules imported so far, imports nothing """
+    loaded = (globals().get(name) for name in SUBMODULES)
+    return {m.__name__.rpartition('.')[2]: m.cache_info() for m in loaded if m is not None and hasattr(m, 'cache_info')}
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,28 @@
+# electronic_fundamentals/__main__.py
+
+"""
+# - python -m electronic_fundamentals                 runs the book examples of every module
+# - python -m electronic_fundamentals resistor design runs only those modules
+
+"""
+import argparse
+
+import electronic_fundamentals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m electronic_fundamentals',
+                                     description='Run the worked examples of the chapter modules')
+    parser.add_argument('modules', nargs='*', metavar='module', help=', '.join(electronic_fundamentals.SUBMODULES))
+    args = parser.parse_args(argv)
+    for name in args.modules or electronic_fundamentals.SUBMODULES:
+        if name not in electronic_fundamentals.SUBMODULES:
+            parser.error(f'unknown module: {name}')
+        module = getattr(electronic_fundamentals, name)
+        if hasattr(module, 'demo'):
+            print(f'== {name}')
+            module.demo()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+# montecarlo.py
+
+"""
+# - Monte-Carlo tolerance analysis of resistor networks (Chapter-6) and RC circuits (Chapter-9)
+# - every part is drawn inside its tolerance band and moved by its tempco for the temperature of the run,
+#   a batch of trials is one 2-D array evaluated with Series.batch / Parallel.batch
+# - batch k always draws from SeedSequence(seed).spawn()[k], so a run gives the same samples in one
+#   process or spread over a process pool of any size
+
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from electronic_fundamentals import resistor
+
+DISTRIBUTIONS = ('normal', 'uniform')
+PERCENTILES = (0.135, 2.5, 50.0, 97.5, 99.865)  # median and the 2 and 3 sigma points of a normal distribution
+
+
+class Distribution:
+    """
+    Samples of one quantity over all the trials of a run
+    Examples:
+        >>> d = Distribution(np.array([1.0, 2.0, 3.0, 4.0]))
+        >>> d.mean, d.min, d.max
+        (2.5, 1.0, 4.0)
+        >>> d.within(1.5, 3.5)
+        0.5
+    """
+
+    def __init__(self, samples: np.ndarray):
+        self.samples = samples
+
+    @property
+    def mean(self) -> float:
+        return float(self.samples.mean())
+
+    @property
+    def std(self) -> float:
+        return float(self.samples.std(ddof=1))
+
+    @property
+    def min(self) -> float:
+        return float(self.samples.min())
+
+    @property
+    def max(self) -> float:
+        return float(self.samples.max())
+
+    def percentiles(self, q=PERCENTILES) -> dict:
+        return dict(zip(q, np.percentile(self.samples, q).tolist()))
+
+    def within(self, low: [int | float], high: [int | float]) -> float:
+        """ fraction of the trials from low to high, the yield of a part with those limits """
+        return float(np.count_nonzero((self.samples >= low) & (self.samples <= high)) / len(self.samples))
+
+    def __len__(self):
+        return len(self.samples)
+
+    def __repr__(self):
+        return f'Distribution(n={len(self):,} mean={self.mean:.6g} std={self.std:.4g} ' \
+               f'min={self.min:.6g} max={self.max:.6g})'
+
+
+class SeriesTrials(NamedTuple):
+    rt: Distribution
+    it: Distribution
+    drops: list[Distribution]  # one per resistor, in circuit order
+
+
+class ParallelTrials(NamedTuple):
+    rt: Distribution
+    it: Distribution
+
+
+# evaluators take one batch of sampled part values, one row per trial, and return a tuple of result columns,
+# they live at module level so a process pool can pickle them
+
+def _series(values, volts):
+    result = resistor.Series.batch(values, volts, decimals=None)
+    return (result.rt, result.it) + tuple(result.drops.T)
+
+
+def _parallel(values, volts):
+    return tuple(resistor.Parallel.batch(values, volts, decimals=None))
+
+
+def _time_constant(values, volts):
+    return (values[:, 0] * values[:, 1],)
+
+
+def _sample(rng, nominal, tolerance, tempco, trials, distribution, temperature):
+    """ (trials, parts) array of part values """
+    shape = (trials, len(nominal))
+    if distribution == 'normal':
+        # the tolerance band is +-3 sigma, parts outside it are rejected at the factory so they are drawn again,
+        # a normal truncated at the band rather than one piled up on its limits
+        spread = rng.standard_normal(shape) / 3
+        while (outside := np.abs(spread) > 1.0).any():
+            spread[outside] = rng.standard_normal(np.count_nonzero(outside)) / 3
+    else:
+        spread = rng.uniform(-1.0, 1.0, shape)
+    drift = 1 + tempco * 1e-6 * (temperature - resistor.REFERENCE_TEMPERATURE)
+    return nominal * drift * (1 + spread * tolerance)
+
+
+def _run_batch(task):
+    evaluate, nominal, tolerance, tempco, volts, distribution, temperature, seed, trials = task
+    rng = np.random.default_rng(seed)
+    return evaluate(_sample(rng, nominal, tolerance, tempco, trials, distribution, temperature), volts)
+
+
+class MonteCarlo:
+    """
+    Runs trials of a circuit with every part value drawn inside its tolerance
+    - distribution 'normal' puts the tolerance at 3 sigma, 'uniform' spreads parts evenly over the band
+    - temperature in °C moves every part by its tempco before the tolerance is applied
+    - batch is the number of trials evaluated as one array, processes > 1 runs the batches on a process pool
+    Examples:
+        >>> r1, r2 = resistor.Resistor(1000, name='R1'), resistor.Resistor(2000, name='R2', tolerance=0.01)
+        >>> mc = MonteCarlo(trials=100_000, seed=7)
+        >>> result = mc.series(resistor.Series([r1, r2], 9, name='S1'))
+        >>> round(result.rt.mean), round(result.drops[0].mean, 2)
+        (3000, 3.0)
+        >>> round(result.drops[0].within(2.9, 3.1), 2)
+        1.0
+        >>> pooled = MonteCarlo(trials=100_000, seed=7, batch=30_000, processes=2)
+        >>> serial = MonteCarlo(trials=100_000, seed=7, batch=30_000)
+        >>> p1 = resistor.Parallel([r1, r2])
+        >>> np.array_equal(pooled.parallel(p1).rt.samples, serial.parallel(p1).rt.samples)
+        True
+    """
+
+    def __init__(self, trials: int = 10 ** 6, seed: [int | None] = None, distribution: str = 'normal',
+                 temperature: [int | float] = resistor.REFERENCE_TEMPERATURE, batch: int = 1 << 17,
+                 processes: int = 1):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f'distribution must be one of {DISTRIBUTIONS}, got {distribution!r}')
+        self.trials = trials
+        self.seed = seed
+        self.distribution = distribution
+        self.temperature = temperature
+        self.batch = batch
+        self.processes = processes
+
+    def run(self, evaluate, nominal, tolerance, tempco=0, volts=1.0) -> list[np.ndarray]:
+        """
+        Calls evaluate(values, volts) on batches of sampled part values and joins the result columns of all batches
+        - nominal, tolerance and tempco hold one entry per part
+        """
+        nominal, tolerance, tempco = np.broadcast_arrays(*(np.asarray(x, dtype=float)
+                                                           for x in (nominal, tolerance, tempco)))
+        sizes = [min(self.batch, self.trials - first) for first in range(0, self.trials, self.batch)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        tasks = [(evaluate, nominal, tolerance, tempco, volts, self.distribution, self.temperature, seed, n)
+                 for seed, n in zip(seeds, sizes)]
+        if self.processes > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(min(self.processes, len(tasks))) as pool:
+                batches = list(pool.map(_run_batch, tasks))
+        else:
+            batches = [_run_batch(task) for task in tasks]
+        return [np.concatenate(column) for column in zip(*batches)]
+
+    @staticmethod
+    def _parts(resistors):
+        return ([r.ohms for r in resistors], [r.tolerance for r in resistors], [r.tempco for r in resistors])
+
+    def series(self, circuit: 'resistor.Series') -> SeriesTrials:
+        """ total resistance, current and the voltage drop of each resistor """
+        rt, it, *drops = self.run(_series, *self._parts(circuit.resistors), volts=circuit.volts)
+        return SeriesTrials(Distribution(rt), Distribution(it), [Distribution(d) for d in drops])
+
+    def parallel(self, circuit: 'resistor.Parallel') -> ParallelTrials:
+        """ total resistance and current """
+        rt, it = self.run(_parallel, *self._parts(circuit.resistors), volts=circuit.volts)
+        return ParallelTrials(Distribution(rt), Distribution(it))
+
+    def time_constant(self, capacitor, ohms_tolerance: float = 0.05, ohms_tempco: [int | float] = 0) -> Distribution:
+        """
+        RC time constant of a Capacitor, whose ohms is a resistor of ohms_tolerance and ohms_tempco
+        Examples:
+            >>> from electronic_fundamentals import capacitor
+            >>> c = capacitor.Capacitor(capacitance=.01e-6, ohms=8.2e3, tolerance=0.1)
+            >>> tau = MonteCarlo(trials=100_000, seed=1).time_constant(c)
+            >>> round(tau.mean * 1e6, 1), tau.min > 82e-6 * 0.95 * 0.9
+            (82.0, True)
+        """
+        (tau,) = self.run(_time_constant, [capacitor.ohms, capacitor.capacitance],
+                          [ohms_tolerance, capacitor.tolerance], [ohms_tempco, capacitor.tempco])
+        return Distribution(tau)
+
+
+def demo():
+    # 10V divider of a 1K and a 2K resistor, 5% parts against 1% parts
+    for tolerance in (0.05, 0.01):
+        r1 = resistor.Resistor(1000, name='R1', tolerance=tolerance)
+        r2 = resistor.Resistor(2000, name='R2', tolerance=tolerance)
+        result = MonteCarlo(trials=10 ** 6, seed=0).series(resistor.Series([r1, r2], 10, name='S1'))
+        vout = result.drops[1]
+        low, high = vout.percentiles((0.135, 99.865)).values()
+        print(f'{tolerance:.0%} parts: vout {vout.mean:.4f}V ±{vout.std:.4f}V, 3σ {low:.4f}V to {high:.4f}V, '
+              f'{vout.within(6.6, 6.733):.2%} within 1%')
+
+
+if __name__ == '__main__':
+    demo()
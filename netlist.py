@@ -0,0 +1,279 @@
+# netlist.py
+
+"""
+# - SPICE-like text files of many circuits, read into and written from the chapter classes
+# - a file is a list of blocks, one per circuit, elements are name node node value [tol=..] [tc=..]
+#       * comment, ; starts a comment at the end of a line
+#       .series S1 V=10          -> Series            R1 1 2 33     R2 2 0 68k tol=1%
+#       .parallel P1 V=10        -> Parallel          R1 1 0 100    R2 1 0 100
+#       .rc RC1 V=50             -> Capacitor         R1 1 2 8.2k   C1 2 0 .01u tol=10% tc=-750
+#       .impedance Z1 f=1k V=10  -> ImpedanceTriangle R1 1 2 10k    C1 2 0 .01u   (or xc=2.2k and no C)
+#       .ends
+#   an R or C line outside a block is a lone Resistor or Capacitor, nodes are kept for SPICE but not used
+# - values take the SPICE suffixes f p n u (or μ) m k meg g t and trailing units (10kΩ, .01uF), tolerances a %
+# - read_circuits streams a file or any iterable of lines, holding one block at a time,
+#   read_circuits_mmap reads through an mmap so multi-GB files are paged by the OS, not copied into memory
+
+"""
+import itertools
+import mmap
+import os
+import re
+
+from electronic_fundamentals import capacitor, impedance, resistor
+
+SUFFIXES = {'t': 1e12, 'g': 1e9, 'meg': 1e6, 'k': 1e3, 'm': 1e-3, 'u': 1e-6, 'μ': 1e-6, 'n': 1e-9,
+            'µ': 1e-6, 'p': 1e-12, 'f': 1e-15, '%': 1e-2}
+# matched against the lowered token, Ω lowers to ω, µ is the micro sign most keyboards type for Greek μ
+_VALUE = re.compile(r'([-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?)(meg|[tgkmuμµnpf%])?[a-zω]*$')
+BLOCKS = ('.series', '.parallel', '.rc', '.impedance')
+
+
+def parse_value(token: str) -> float:
+    """
+    Examples:
+        >>> parse_value('68k'), parse_value('.01uF'), parse_value('2.2Meg'), parse_value('5%')
+        (68000.0, 1e-08, 2200000.0, 0.05)
+        >>> parse_value('10kΩ'), parse_value('4.7µF'), parse_value('4.7μF')
+        (10000.0, 4.7e-06, 4.7e-06)
+    """
+    try:
+        return float(token)
+    except ValueError:
+        pass
+    match = _VALUE.match(token.lower())
+    if match is None:
+        raise ValueError(f'not a value: {token!r}')
+    number, suffix = match.groups()
+    return float(number) * SUFFIXES.get(suffix, 1.0)
+
+
+def format_value(value: [int | float]) -> str:
+    """ shortest text that reads back as the same value """
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def _parameters(tokens, number):
+    """ {key: value} of key=value tokens """
+    parameters = {}
+    for token in tokens:
+        key, sep, value = token.partition('=')
+        if not sep:
+            raise ValueError(f'line {number}: expected key=value, got {token!r}')
+        parameters[key.lower()] = parse_value(value)
+    return parameters
+
+
+def _element(tokens, number):
+    if len(tokens) < 4:
+        raise ValueError(f'line {number}: expected name node node value, got {" ".join(tokens)!r}')
+    name, value = tokens[0], parse_value(tokens[3])
+    parameters = _parameters(tokens[4:], number)
+    kind = name[0].upper()
+    if kind == 'R':
+        return resistor.Resistor(value, name=name, tolerance=parameters.get('tol', 0.05),
+                                 tempco=parameters.get('tc', 0))
+    if kind == 'C':
+        return capacitor.Capacitor(capacitance=value, tolerance=parameters.get('tol', 0.1),
+                                   tempco=parameters.get('tc', 0), name=name)
+    raise ValueError(f'line {number}: unknown element {name!r}, expected R or C')
+
+
+def _block(kind, name, parameters, parts, number):
+    resistors = [p for p in parts if isinstance(p, resistor.Resistor)]
+    capacitors = [p for p in parts if isinstance(p, capacitor.Capacitor)]
+    volts = parameters.get('v')
+    if kind in ('.series', '.parallel'):
+        if capacitors or not resistors:
+            raise ValueError(f'line {number}: {kind} {name} takes one or more resistors only')
+        if kind == '.series':
+            return resistor.Series(resistors, 1 if volts is None else volts, name=name)
+        return resistor.Parallel(resistors, 1 if volts is None else volts, name=name)
+    if len(resistors) != 1 or len(capacitors) > 1 or (kind == '.rc' and not capacitors):
+        raise ValueError(f'line {number}: {kind} {name} takes one resistor and one capacitor')
+    c = capacitors[0] if capacitors else None
+    if kind == '.rc':
+        c.ohms = resistors[0].ohms
+        c.name = name
+        if volts is not None:
+            c.volts = volts
+        return c
+    triangle = impedance.ImpedanceTriangle(resistors[0].ohms, parameters.get('xc', 0.0), name=name)
+    if c is not None:
+        if 'f' not in parameters:
+            raise ValueError(f'line {number}: .impedance {name} needs f= to turn its capacitor into xc')
+        triangle.calculate_xc(parameters['f'], c.capacitance)
+    if volts is not None:
+        triangle.calculate_volts(volts / triangle.z)
+    return triangle
+
+
+def read_circuits(source):
+    """
+    Yields a Resistor, Capacitor, Series, Parallel or ImpedanceTriangle for every circuit in source,
+    a path or any iterable of lines such as an open file
+    Examples:
+        >>> deck = ['* divider', '.series S1 V=10', 'R1 1 2 1k', 'R2 2 0 1k tol=1%', '.ends', 'R9 1 0 4.7k']
+        >>> s1, r9 = read_circuits(deck)
+        >>> s1.symbol, s1.rt, s1.voltage_drops, s1.resistors[1].tolerance
+        ('S1', 2000.0, {'R1=1000.0Ω': 5.0, 'R2=1000.0Ω': 5.0}, 0.01)
+        >>> r9.symbol, r9.ohms
+        ('R9', 4700.0)
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8') as lines:
+            yield from read_circuits(lines)
+        return
+    block = None  # (kind, name, parameters, parts) of the circuit being read
+    for number, line in enumerate(source, start=1):
+        if ';' in line:
+            line = line[:line.index(';')]
+        tokens = line.split()
+        if not tokens or tokens[0][0] == '*':
+            continue
+        head = tokens[0].lower()
+        if head[0] != '.':
+            element = _element(tokens, number)
+            if block is None:
+                yield element
+            else:
+                block[3].append(element)
+        elif head in BLOCKS:
+            if block is not None:
+                raise ValueError(f'line {number}: {head} inside {block[0]} {block[1]}, missing .ends')
+            if len(tokens) < 2:
+                raise ValueError(f'line {number}: {head} needs a circuit name')
+            block = (head, tokens[1], _parameters(tokens[2:], number), [])
+        elif head == '.ends':
+            if block is None:
+                raise ValueError(f'line {number}: .ends outside a circuit')
+            yield _block(*block, number)
+            block = None
+        elif head == '.end':
+            break
+        else:
+            raise ValueError(f'line {number}: unknown directive {tokens[0]!r}')
+    if block is not None:
+        raise ValueError(f'{block[0]} {block[1]} is missing .ends')
+
+
+def read_circuits_mmap(path):
+    """ read_circuits of a file through a read only mmap, the OS pages the file in and out as it is read """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield from read_circuits(line.decode('utf-8') for line in iter(mapped.readline, b''))
+
+
+def _name(symbol, fallback: str, prefix: str = '') -> str:
+    """ symbol without whitespace, fallback when that is no identifier (the source text of an inline circuit),
+    element names must also start with their type letter """
+    name = ''.join(str(symbol or '').split())
+    if not name.isidentifier():
+        return fallback
+    return name if name[:len(prefix)].upper() == prefix else prefix + name
+
+
+def _element_names(parts) -> list[str]:
+    """ names of the resistors of a block, one already taken (unnamed parts share a symbol) becomes R1, R2, ... """
+    names, taken = [], set()
+    generated = (f'R{k}' for k in itertools.count(1))
+    for r in parts:
+        name = _name(r.symbol, '', 'R')
+        while not name or name.upper() in taken:
+            name = next(generated)
+        taken.add(name.upper())
+        names.append(name)
+    return names
+
+
+def _lines(circuit, number):
+    """ the netlist lines of a circuit, number is its position in the file, for generated names """
+    if isinstance(circuit, resistor.Resistor):
+        return [_resistor_line(circuit, _name(circuit.symbol, f'R{number}', 'R'), 1, 0)]
+    if isinstance(circuit, resistor.Series):
+        parts = circuit.resistors
+        return ([f'.series {_name(circuit.symbol, f"S{number}")} V={format_value(circuit.volts)}']
+                + [_resistor_line(r, name, k + 1, (k + 2) % (len(parts) + 1))
+                   for k, (r, name) in enumerate(zip(parts, _element_names(parts)))] + ['.ends'])
+    if isinstance(circuit, resistor.Parallel):
+        parts = circuit.resistors
+        return ([f'.parallel {_name(circuit.symbol, f"P{number}")} V={format_value(circuit.volts)}']
+                + [_resistor_line(r, name, 1, 0) for r, name in zip(parts, _element_names(parts))] + ['.ends'])
+    if isinstance(circuit, capacitor.Capacitor):
+        return [f'.rc {_name(circuit.name, f"RC{number}")} V={format_value(circuit.volts)}',
+                f'R1 1 2 {format_value(circuit.ohms)}', _capacitor_line(circuit, 2, 0), '.ends']
+    if isinstance(circuit, impedance.ImpedanceTriangle):
+        head = f'.impedance {_name(circuit.symbol, f"Z{number}")}'
+        if circuit.volts:
+            head += f' V={format_value(circuit.volts)}'
+        if circuit.farads and circuit.frequency:
+            return [f'{head} f={format_value(circuit.frequency)}', f'R1 1 2 {format_value(circuit.resistor)}',
+                    f'C1 2 0 {format_value(circuit.farads)}', '.ends']
+        return [f'{head} xc={format_value(circuit.xc)}', f'R1 1 0 {format_value(circuit.resistor)}', '.ends']
+    raise TypeError(f'cannot write {type(circuit).__name__} to a netlist')
+
+
+def _resistor_line(r, name, a, b):
+    line = f'{name} {a} {b} {format_value(r.ohms)}'
+    if r.tolerance != 0.05:
+        line += f' tol={format_value(r.tolerance)}'
+    return line + (f' tc={format_value(r.tempco)}' if r.tempco else '')
+
+
+def _capacitor_line(c, a, b):
+    """ the capacitor of an .rc block, the block carries its name """
+    line = f'C1 {a} {b} {format_value(c.capacitance)}'
+    if c.tolerance != 0.1:
+        line += f' tol={format_value(c.tolerance)}'
+    return line + (f' tc={format_value(c.tempco)}' if c.tempco else '')
+
+
+def write_circuits(circuits, out) -> int:
+    """
+    Writes every circuit to the text stream out, returns the number of circuits written
+    Examples:
+        >>> import io
+        >>> out = io.StringIO()
+        >>> p1 = resistor.Parallel([resistor.Resistor(100, name='R1'), resistor.Resistor(300, name='R2')], 6)
+        >>> write_circuits([p1, capacitor.Capacitor(.01e-6, 8.2e3, name='RC1')], out)
+        2
+        >>> print(out.getvalue(), end='')
+        .parallel p1 V=6
+        R1 1 0 100
+        R2 1 0 300
+        .ends
+        .rc RC1 V=50.0
+        R1 1 2 8200.0
+        C1 2 0 1e-08
+        .ends
+        >>> p, c = read_circuits(out.getvalue().splitlines())
+        >>> p.symbol, p.rt(), p.volts, c.name, c.time_constant == 8.2e3 * .01e-6
+        ('p1', 75.0, 6.0, 'RC1', True)
+
+        Unnamed parts share the symbol of the line they were built on, and inline circuits have no name at all
+        >>> out = io.StringIO()
+        >>> s = resistor.Series([resistor.Resistor(100), resistor.Resistor(220), resistor.Resistor(100)], 12)
+        >>> write_circuits([s, resistor.Parallel([resistor.Resistor(50), resistor.Resistor(50)], 5)], out)
+        2
+        >>> print(out.getvalue(), end='')
+        .series s V=12
+        Rs 1 2 100
+        R1 2 3 220
+        R2 3 0 100
+        .ends
+        .parallel P2 V=5
+        R1 1 0 50
+        R2 1 0 50
+        .ends
+        >>> back_s, back_p = read_circuits(out.getvalue().splitlines())
+        >>> back_s.symbol, back_s.rt, back_s.voltage_drops
+        ('s', 420.0, {'RS=100.0Ω': 2.86, 'R1=220.0Ω': 6.29, 'R2=100.0Ω': 2.86})
+        >>> back_p.symbol, [r.symbol for r in back_p.resistors], back_p.rt()
+        ('P2', ['R1', 'R2'], 25.0)
+    """
+    count = 0
+    for count, circuit in enumerate(circuits, start=1):
+        out.write('\n'.join(_lines(circuit, count)))
+        out.write('\n')
+    return count
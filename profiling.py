@@ -0,0 +1,183 @@
+# profiling.py
+
+"""
+# - Opt-in call counters for the hot methods of the circuit classes, which calls dominate a workload
+# - enable() swaps each method in HOOKS for a wrapper counting calls, cumulative seconds and, for values
+#   kept in a per-object _derived cache, the calls that found it filled; disable() puts the original
+#   functions back, so nothing is left on the call path when profiling is off
+# - snapshot() is a dict of the counters, prometheus() the counters and module cache statistics in the
+#   Prometheus text exposition format
+# - constructors are not wrapped, they read the caller's frame for the object's name and a wrapper
+#   would move it, _assigned_name counts the source line lookups instead
+
+"""
+import contextlib
+import functools
+import time
+
+import electronic_fundamentals
+
+# submodule: class attributes and module functions to instrument
+HOOKS = {
+    'resistor': ('Resistor.symbol', 'Resistor.current', 'Resistor.power', 'Resistor.voltage_drop', 'Series.rt',
+                 'Series.it', 'Series.voltage_drops', 'Series.symbol', 'Series.batch', 'Parallel.rt',
+                 'Parallel.branch_currents', 'Parallel.power', 'Parallel.batch', '_assigned_name'),
+    'capacitor': ('Capacitor.charge_time', 'Capacitor.discharge_time', 'Capacitor.charge_curve',
+                  'Capacitor.discharge_curve', 'Capacitor.time_constant'),
+    'impedance': ('ImpedanceTriangle.z', 'ImpedanceTriangle.phase_angle', 'ImpedanceTriangle.symbol',
+                  'ImpedanceTriangle.calculate_xc', 'ImpedanceTriangle.calculate_volts',
+                  'ImpedanceTriangle.calculate_all', 'ImpedanceTriangle.sweep'),
+    'design': ('PowerSupply.calc_mfd', 'PowerSupply.calc_ripple', 'PowerSupply.sweep'),
+}
+# read their result from the object's _derived cache, a call with it filled is a hit
+CACHED = frozenset({'resistor.Series.rt', 'resistor.Series.it', 'resistor.Series.voltage_drops',
+                    'impedance.ImpedanceTriangle.z', 'impedance.ImpedanceTriangle.phase_angle'})
+
+PREFIX = 'electronic_fundamentals'  # of the Prometheus metric names
+
+_originals = {}  # 'module.attribute': (owner, name, original class or module attribute)
+_counters = {}  # 'module.attribute': Counter, kept across disable() until reset()
+
+
+class Counter:
+    __slots__ = ('calls', 'seconds', 'hits')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.hits = 0
+
+    def as_dict(self, cached: bool) -> dict:
+        counts = {'calls': self.calls, 'seconds': self.seconds}
+        if cached:
+            counts['cache_hits'] = self.hits
+        return counts
+
+
+def _wrap(function, counter, cached):
+    perf_counter = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if cached and args[0]._derived is not None:
+            counter.hits += 1
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            counter.calls += 1
+            counter.seconds += perf_counter() - start
+
+    return wrapper
+
+
+def _instrument(attribute, counter, cached):
+    """ the same kind of class attribute (property, staticmethod or function) calling through a wrapper """
+    if isinstance(attribute, property):
+        return property(_wrap(attribute.fget, counter, cached), attribute.fset, attribute.fdel, attribute.__doc__)
+    if isinstance(attribute, staticmethod):
+        return staticmethod(_wrap(attribute.__func__, counter, cached))
+    return _wrap(attribute, counter, cached)
+
+
+def enable(modules=tuple(HOOKS)):
+    """
+    Instruments the HOOKS of modules, importing them, counting carries on from any earlier run until reset()
+    Examples:
+        >>> reset()
+        >>> enable(['resistor'])
+        >>> s = electronic_fundamentals.resistor.Series([electronic_fundamentals.resistor.Resistor(10, name='R1')],
+        ...                                            5, name='S')
+        >>> s.rt, s.it, s.rt
+        (10, 0.5, 10)
+        >>> disable()
+        >>> snapshot()['resistor.Series.rt']['calls'], snapshot()['resistor.Series.rt']['cache_hits']
+        (2, 1)
+        >>> enabled()
+        False
+    """
+    for module_name in modules:
+        if module_name not in HOOKS:
+            raise ValueError(f'no hooks for {module_name!r}, expected one of {tuple(HOOKS)}')
+        module = getattr(electronic_fundamentals, module_name)
+        for path in HOOKS[module_name]:
+            key = f'{module_name}.{path}'
+            if key in _originals:
+                continue
+            owner_name, _, name = path.rpartition('.')
+            owner = getattr(module, owner_name) if owner_name else module
+            original = vars(owner)[name]
+            counter = _counters.setdefault(key, Counter())
+            setattr(owner, name, _instrument(original, counter, key in CACHED))
+            _originals[key] = (owner, name, original)
+
+
+def disable():
+    """ puts back every original method, the counters are kept """
+    while _originals:
+        _, (owner, name, original) = _originals.popitem()
+        setattr(owner, name, original)
+
+
+def enabled() -> bool:
+    return bool(_originals)
+
+
+def reset():
+    """ zeroes every counter """
+    _counters.clear()
+    for key, (owner, name, original) in _originals.items():
+        counter = _counters[key] = Counter()
+        setattr(owner, name, _instrument(original, counter, key in CACHED))
+
+
+@contextlib.contextmanager
+def profiled(modules=tuple(HOOKS)):
+    """ with profiled(): ... counts the block from zero, snapshot() afterwards reads what it did """
+    reset()
+    enable(modules)
+    try:
+        yield
+    finally:
+        disable()
+
+
+def snapshot() -> dict:
+    """ {'module.Class.method': {'calls', 'seconds', 'cache_hits' when cached}} of every method called so far """
+    return {key: counter.as_dict(key in CACHED) for key, counter in sorted(_counters.items()) if counter.calls}
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def prometheus(prefix: str = PREFIX) -> str:
+    """
+    snapshot() and the process wide caches of the loaded modules in the Prometheus text format
+    Examples:
+        >>> reset()
+        >>> with profiled(['capacitor']):
+        ...     _ = electronic_fundamentals.capacitor.Capacitor(1e-6, 1e3, 10).charge_time(1e-3)
+        >>> print('\\n'.join(line for line in prometheus().splitlines() if line.startswith(f'{PREFIX}_calls')))
+        electronic_fundamentals_calls_total{module="capacitor",method="Capacitor.charge_time"} 1
+        electronic_fundamentals_calls_total{module="capacitor",method="Capacitor.time_constant"} 1
+    """
+    counters = snapshot()
+    metrics = (('calls_total', 'calls', 'Calls of an instrumented method'),
+               ('seconds_total', 'seconds', 'Cumulative seconds in an instrumented method'),
+               ('cache_hits_total', 'cache_hits', 'Calls that found the derived value cache filled'))
+    lines = []
+    for metric, field, description in metrics:
+        lines += [f'# HELP {prefix}_{metric} {description}', f'# TYPE {prefix}_{metric} counter']
+        for key, counts in counters.items():
+            if field in counts:
+                module, _, method = key.partition('.')
+                labels = f'module="{_escape(module)}",method="{_escape(method)}"'
+                lines.append(f'{prefix}_{metric}{{{labels}}} {counts[field]}')
+    caches = electronic_fundamentals.cache_info()
+    for field in ('hits', 'misses', 'currsize'):
+        kind = 'gauge' if field == 'currsize' else 'counter'
+        name = f'{prefix}_lru_{field}' + ('' if kind == 'gauge' else '_total')
+        lines += [f'# HELP {name} Process wide cache {field}', f'# TYPE {name} {kind}']
+        lines += [f'{name}{{module="{_escape(module)}"}} {getattr(info, field)}' for module, info in caches.items()]
+    return '\n'.join(lines) + '\n'
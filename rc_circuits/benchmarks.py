@@ -0,0 +1,76 @@
+# rc_circuits/benchmarks.py
+
+"""
+# - Timing comparisons for the ac circuit calculations in impedance.py
+# - run with python benchmarks.py from the rc_circuits directory
+
+"""
+import math
+import time
+
+import numpy as np
+
+from impedance import ImpedanceTriangle
+from rc_filter import RCCascade
+
+SCALAR_LIMIT = 10 ** 4  # per-object loops are timed on at most this many frequencies and scaled up
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def _scalar_sweep(resistor, farads, frequencies, volts):
+    t = ImpedanceTriangle(resistor=resistor, name='t')
+    for f in frequencies:
+        t.calculate_xc(frequency=f, farads=farads)
+        t.z, t.phase_angle, volts / t.z
+
+
+def bench_sweep(n=10 ** 6, resistor=2.2e3, farads=.022e-6, volts=10):
+    """
+    Prints the time to sweep n log spaced frequencies with calculate_xc per point and with sweep()
+    """
+    frequencies = ImpedanceTriangle.frequencies(1, 1e9, n)
+    m = min(n, SCALAR_LIMIT)
+    scalar = _timed(_scalar_sweep, resistor, farads, frequencies[:m].tolist(), volts) * n / m
+    vector = _timed(ImpedanceTriangle.sweep, resistor, farads, frequencies, volts)
+    print(f'n={n:,} frequencies scalar={scalar:.3f}s sweep={vector:.4f}s speedup={scalar / vector:.0f}x')
+
+
+def _scalar_response(ohms, farads, frequencies):
+    """ loaded low-pass response of one design, one complex number at a time """
+    response = []
+    for f in frequencies:
+        jw = 2j * math.pi * f
+        a, b = 1, 0
+        for r, c in zip(ohms, farads):
+            a, b = a * (1 + r * jw * c) + b * jw * c, a * r + b
+        response.append(1 / a)
+    return response
+
+
+def bench_filter_design(stages=(2, 3, 4), points=512):
+    """
+    Prints the time to design and rank every candidate of an n stage 1kHz low-pass, and to evaluate the
+    responses of the candidates at points frequencies in one batch against one design at a time
+    """
+    for n in stages:
+        start = time.perf_counter()
+        candidates = RCCascade.design(1e3, stages=n, top=None)
+        design = time.perf_counter() - start
+        frequencies = np.geomspace(10, 1e5, points)
+        batch = _timed(candidates.response, frequencies)
+        m = min(len(candidates), SCALAR_LIMIT // points)
+        scalar = _timed(lambda: [_scalar_response(r, c, frequencies.tolist())
+                                 for r, c in zip(candidates.ohms[:m].tolist(), candidates.farads[:m].tolist())])
+        scalar *= len(candidates) / m
+        print(f'{n} stage low-pass {len(candidates):,} candidates design={design:.3f}s '
+              f'response x{points} batch={batch:.3f}s one at a time={scalar:.3f}s')
+
+
+if __name__ == '__main__':
+    bench_sweep()
+    bench_filter_design()
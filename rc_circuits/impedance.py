@@ -1,18 +1,53 @@
 # pp.442 Electronic Fundamentals
+import functools
+import linecache
 import math
-import traceback
+import sys
+from typing import NamedTuple
+
+import numpy as np
 
 from my_symbols import *
 
+CACHE_SIZE = 4096  # distinct (resistor, xc) pairs whose z and phase angle are shared process wide
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE, typed=True)
+def _triangle(resistor, xc):
+    """ (z, phase angle in degrees) of a resistor and reactance, shared by every ImpedanceTriangle of those values """
+    return math.sqrt(resistor ** 2 + xc ** 2), math.degrees(math.atan(xc / resistor))
+
+
+def cache_info():
+    """ hits, misses, maxsize and currsize of the process wide cache of impedance triangles
+    Examples:
+        >>> cache_clear()
+        >>> a, b = ImpedanceTriangle(1e3, 2.2e3, name='A'), ImpedanceTriangle(1e3, 2.2e3, name='B')
+        >>> round(a.z, 1), round(b.z, 1), round(b.phase_angle, 2)
+        (2416.6, 2416.6, 65.56)
+        >>> round(b.calculate_xc(frequency=1e3, farads=.01e-6), 1)
+        15915.5
+        >>> round(b.z, 1)
+        15946.9
+        >>> cache_info()
+        CacheInfo(hits=1, misses=2, maxsize=4096, currsize=2)
+    """
+    return _triangle.cache_info()
+
+
+def cache_clear():
+    _triangle.cache_clear()
+
 
 class ImpedanceTriangle:
 
-    def __init__(self, resistor: [int | float] = 47.0, xc: [int | float] = 100.0):
+    def __init__(self, resistor: [int | float] = 47.0, xc: [int | float] = 100.0, name: [str | None] = None):
         """
         Calculates the phase angle, and impedance of a simple rc circuit
 
         :resistor: in ohms
         :xc: result of 1/(2pi*f*c) in ohms
+        :name: symbol shown by __repr__, read from the calling source line on first use when omitted
         Examples:
             >>> x = ImpedanceTriangle()
             >>> x.phase_angle
@@ -32,13 +67,27 @@ class ImpedanceTriangle:
         self._current = 0.0
         self._volts = 0.0
         self._farads = 0.0
-        self._function_name = ""
-        (self._filename, self._line_number, self._function_name, text) = traceback.extract_stack()[-2]
-        self._def_name = text[:text.find('=')].strip()
+        frame = sys._getframe(1)
+        self._filename, self._line_number = frame.f_code.co_filename, frame.f_lineno
+        self._function_name = frame.f_code.co_name
+        self._def_name = name
         self._z = 0.0
         self._vr = 0.0  # voltage drop across the resistor
         self._vc = 0.0  # voltage drop across the capacitor
         self._vs = 0.0  # voltage source
+        self._derived = None  # (z, phase angle) until an input changes
+
+    @property
+    def symbol(self):
+        """ the name given to the constructor, or the variable it was assigned to """
+        if self._def_name is None:
+            text = linecache.getline(self._filename, self._line_number).strip()
+            self._def_name = text[:text.find('=')].strip()
+        return self._def_name
+
+    @property
+    def resistor(self):
+        return self._resistor
 
     @property
     # source voltage
@@ -52,14 +101,20 @@ class ImpedanceTriangle:
     @frequency.setter
     def frequency(self, value: [int | float]):
         self._frequency = value
+        self._derived = None
+
+    def _values(self):
+        if self._derived is None:
+            self._derived = _triangle(self._resistor, self._xc)
+        return self._derived
 
     @property
     def phase_angle(self) -> float:
-        return math.degrees(math.atan(self._xc / self._resistor))
+        return self._values()[1]
 
     @property
     def z(self):
-        self._z = math.sqrt(self._resistor ** 2 + self._xc ** 2)
+        self._z = self._values()[0]
         return self._z
 
     @property
@@ -78,6 +133,7 @@ class ImpedanceTriangle:
     # set the voltage drop across the resistor
     def vr(self, value):
         self._vr = value
+        self._derived = None
 
     @property
     def vc(self):
@@ -86,6 +142,7 @@ class ImpedanceTriangle:
     @vc.setter
     def vc(self, value):
         self._vc = value
+        self._derived = None
 
     @property
     def volts(self):
@@ -94,6 +151,7 @@ class ImpedanceTriangle:
     @volts.setter
     def volts(self, value: [int | float]) -> float:
         self._volts = value
+        self._derived = None
         if self._resistor != 0 and self._xc != 0:
             self._vr = math.sqrt(self._resistor ** 2 + self.xc ** 2)
 
@@ -104,6 +162,7 @@ class ImpedanceTriangle:
     @farads.setter
     def farads(self, value: [int | float]) -> float:
         self._farads = value
+        self._derived = None
 
     @property
     def xc(self):
@@ -115,16 +174,20 @@ class ImpedanceTriangle:
         self._farads = farads
         self._frequency = frequency
         self._xc = 1 / (2 * math.pi * frequency * farads)
+        self._derived = None
         return self._xc
 
-    def calculate_volts(self, current: [int | float]):
-        self._current = current
-        self._volts = current * self.z
+    def calculate_volts(self, current: [int | float | None] = None):
+        """ volts = current * z, uses the current already set when none is passed """
+        if current is not None:
+            self._current = current
+        self._volts = self._current * self.z
         return self._volts
 
     def calculate_all(self):
         if self._frequency != 0 and self._farads != 0:
-            self._xc = self._xc = 1 / (2 * math.pi * self._frequency * self._farads)
+            self._xc = 1 / (2 * math.pi * self._frequency * self._farads)
+            self._derived = None
         else:
             print(f"\t*** Frequency {self._frequency} or farads {self._farads} not set ***")
         if self._volts != 0 and self._xc != 0:
@@ -135,8 +198,58 @@ class ImpedanceTriangle:
         if self._vr != 0 and self._vc != 0:
             self._vs = math.sqrt(self._vr ** 2 + self._vc ** 2)
 
+    @staticmethod
+    def frequencies(start: [int | float], stop: [int | float], points: int, log: bool = True) -> np.ndarray:
+        """ frequency grid for sweep(), log spaced (decades) by default or linear
+        Examples:
+            >>> ImpedanceTriangle.frequencies(10, 1e3, 3).tolist()
+            [10.0, 100.0, 1000.0]
+            >>> ImpedanceTriangle.frequencies(0, 1e3, 3, log=False).tolist()
+            [0.0, 500.0, 1000.0]
+        """
+        if log:
+            return np.logspace(math.log10(start), math.log10(stop), points)
+        return np.linspace(start, stop, points)
+
+    @staticmethod
+    def sweep(resistor: [int | float], farads: [int | float], frequencies, volts: [int | float] = 1.0) -> 'Sweep':
+        """
+        Xc, Z, phase angle, current, VR and VC of a series rc circuit at every frequency in one vectorized pass,
+        nothing is stored on an ImpedanceTriangle
+        - at 0Hz (DC) Xc and Z are infinite, no current flows and the capacitor takes all of volts
+        Examples:
+            >>> s = ImpedanceTriangle.sweep(resistor=2.2e3, farads=.022e-6, frequencies=[1.5e3], volts=10)
+            >>> round(s.xc[0], 1), round(s.z[0], 1), round(s.phase_angle[0], 2)
+            (4822.9, 5301.0, 65.48)
+            >>> round(s.current[0] * 1e3, 3), round(s.vr[0], 2), round(s.vc[0], 2)
+            (1.886, 4.15, 9.1)
+
+            The same values as calculate_xc, z and phase_angle of one triangle per frequency
+            >>> f = ImpedanceTriangle.frequencies(10, 1e5, 9)
+            >>> s = ImpedanceTriangle.sweep(2.2e3, .022e-6, f)
+            >>> triangles = [ImpedanceTriangle(2.2e3, name='t') for _ in f]
+            >>> scalar = np.array([(t.calculate_xc(k, .022e-6), t.z, t.phase_angle) for t, k in zip(triangles, f)])
+            >>> bool(np.allclose(scalar, np.column_stack([s.xc, s.z, s.phase_angle]), rtol=1e-12, atol=0))
+            True
+
+            >>> s = ImpedanceTriangle.sweep(1e3, 1e-6, ImpedanceTriangle.frequencies(0, 1e3, 3, log=False), volts=5)
+            >>> s.xc[0], s.phase_angle[0], s.current[0], s.vr[0], s.vc[0]
+            (inf, 90.0, 0.0, 0.0, 5.0)
+        """
+        frequency = np.asarray(frequencies, dtype=float)
+        if (frequency < 0).any():
+            raise ValueError('frequencies must be 0 or more')
+        dc = frequency == 0
+        with np.errstate(divide='ignore'):
+            xc = 1 / (2 * math.pi * frequency * farads)
+        z = np.sqrt(resistor ** 2 + xc ** 2)
+        phase_angle = np.degrees(np.arctan(xc / resistor))
+        current = volts / z
+        vc = np.where(dc, float(volts), current * np.where(dc, 0.0, xc))
+        return Sweep(frequency, xc, z, phase_angle, current, current * resistor, vc)
+
     def __repr__(self):
-        return f'- {self._def_name:20}:' \
+        return f'- {self.symbol:20}:' \
                f'\n\txc = {self._xc:8.2e} {MU_SYMBOL}F={self._farads:8.2e} f={self._frequency:,.2e}' \
                f'\n\tZ = {self.z:8.2e}' \
                f'\n\t{THETA_SYMBOL} = {self.phase_angle:2.2f}{DEGREE_SYMBOL}' \
@@ -147,29 +260,45 @@ class ImpedanceTriangle:
                f'  '
 
 
-example_10_1 = ImpedanceTriangle()
-print(example_10_1)
-related_problem_10_1 = ImpedanceTriangle(resistor=1e3, xc=2.2e3)
-print(related_problem_10_1)
-# Example 10-2
-example_10_2 = ImpedanceTriangle(resistor=10e3)
-# set xc
-example_10_2.calculate_xc(frequency=1e3, farads=.01e-6)
-# get xc
-example_10_2.calculate_volts(current=.2e-3)
-print(example_10_2)
-example_10_3 = ImpedanceTriangle(resistor=2.2e3)
-example_10_3.farads = .022e-6
-example_10_3.frequency = 1.5e3
-example_10_3.volts = 10
-example_10_3.calculate_all()
-print(example_10_3)
-
-# Example 10-4, determine source voltage and the phase angle of fig, 10-4
-example_10_4 = ImpedanceTriangle()
-example_10_4.vr = 10
-example_10_4.vc = 15
-example_10_4.calculate_all()
-print(example_10_4)
-example_10_4.calculate_volts()
-print(example_10_4)
+class Sweep(NamedTuple):
+    """ Results of ImpedanceTriangle.sweep, one entry per frequency """
+    frequency: np.ndarray
+    xc: np.ndarray
+    z: np.ndarray
+    phase_angle: np.ndarray
+    current: np.ndarray
+    vr: np.ndarray
+    vc: np.ndarray
+
+
+def demo():
+    example_10_1 = ImpedanceTriangle()
+    print(example_10_1)
+    related_problem_10_1 = ImpedanceTriangle(resistor=1e3, xc=2.2e3)
+    print(related_problem_10_1)
+    # Example 10-2
+    example_10_2 = ImpedanceTriangle(resistor=10e3)
+    # set xc
+    example_10_2.calculate_xc(frequency=1e3, farads=.01e-6)
+    # get xc
+    example_10_2.calculate_volts(current=.2e-3)
+    print(example_10_2)
+    example_10_3 = ImpedanceTriangle(resistor=2.2e3)
+    example_10_3.farads = .022e-6
+    example_10_3.frequency = 1.5e3
+    example_10_3.volts = 10
+    example_10_3.calculate_all()
+    print(example_10_3)
+
+    # Example 10-4, determine source voltage and the phase angle of fig, 10-4
+    example_10_4 = ImpedanceTriangle()
+    example_10_4.vr = 10
+    example_10_4.vc = 15
+    example_10_4.calculate_all()
+    print(example_10_4)
+    example_10_4.calculate_volts()
+    print(example_10_4)
+
+
+if __name__ == '__main__':
+    demo()
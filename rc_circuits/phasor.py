@@ -0,0 +1,244 @@
+# rc_circuits/phasor.py
+
+"""
+# - Complex (phasor) impedance of any series/parallel network of resistors, inductors and capacitors
+# - a network is reduced once to a tree of NumPy functions of jw, then evaluated over NumPy frequency arrays
+
+"""
+import math
+
+import numpy as np
+
+OMEGA_SYMBOL = "\u03A9"
+
+
+class Element:
+    """ Base of every network node, + joins in series and | joins in parallel """
+
+    def __add__(self, other):
+        return series(self, other)
+
+    def __or__(self, other):
+        return parallel(self, other)
+
+    def compile(self) -> 'CompiledNetwork':
+        return CompiledNetwork(self)
+
+    def impedance(self, frequencies) -> 'Response':
+        """ compile and evaluate in one call, keep the result of compile() when sweeping repeatedly """
+        return self.compile()(frequencies)
+
+    def _reduced(self) -> 'Element':
+        return self
+
+    def _function(self):
+        """ function of an array of w (2 pi f) returning the complex impedance at each """
+        raise NotImplementedError
+
+
+def _reactive(reactance: np.ndarray) -> np.ndarray:
+    """ complex impedance of a pure reactance, built so an infinite one keeps a 0 real part instead of nan """
+    z = np.zeros(reactance.shape, dtype=complex)
+    z.imag = reactance
+    return z
+
+
+class Resistance(Element):
+    def __init__(self, ohms: [int | float]):
+        self.ohms = float(ohms)
+
+    def _function(self):
+        z = complex(self.ohms)
+        return lambda w: np.full(w.shape, z)
+
+    def __repr__(self):
+        return f'R({self.ohms:,}{OMEGA_SYMBOL})'
+
+
+class Inductance(Element):
+    def __init__(self, henries: [int | float]):
+        self.henries = float(henries)
+
+    def _function(self):
+        henries = self.henries
+        return lambda w: _reactive(w * henries)
+
+    def __repr__(self):
+        return f'L({self.henries:e}H)'
+
+
+class Capacitance(Element):
+    """ open (infinite impedance) at DC """
+
+    def __init__(self, farads: [int | float]):
+        self.farads = float(farads)
+
+    def _function(self):
+        farads = self.farads
+
+        def impedance(w):
+            with np.errstate(divide='ignore'):
+                return _reactive(-1 / (w * farads))
+        return impedance
+
+    def __repr__(self):
+        return f'C({self.farads:e}F)'
+
+
+class _Group(Element):
+    """ Children joined the same way, nested groups of the same kind are flattened """
+
+    def __init__(self, *elements: Element):
+        self.elements = []
+        for e in elements:
+            self.elements.extend(e.elements if type(e) is type(self) else [e])
+
+    def _reduced(self):
+        """ merge like elements into one before compiling, e.g. all resistors of a series string """
+        resistors, inductors, capacitors, others = [], [], [], []
+        for e in (child._reduced() for child in self.elements):
+            {Resistance: resistors, Inductance: inductors, Capacitance: capacitors}.get(type(e), others).append(e)
+        merged = self._merge(resistors, inductors, capacitors) + others
+        return merged[0] if len(merged) == 1 else type(self)(*merged)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({", ".join(map(repr, self.elements))})'
+
+
+def _reciprocal_sum(values):
+    """ 1 / (1/v1 + 1/v2 + ...), 0 when any value is 0 """
+    return 0.0 if 0 in values else 1 / math.fsum(1 / v for v in values)
+
+
+class SeriesNetwork(_Group):
+    """ Z = Z1 + Z2 + ... """
+
+    @staticmethod
+    def _merge(resistors, inductors, capacitors):
+        merged = []
+        if resistors:
+            merged.append(Resistance(math.fsum(r.ohms for r in resistors)))
+        if inductors:
+            merged.append(Inductance(math.fsum(coil.henries for coil in inductors)))
+        if capacitors:
+            # a 0F capacitor is open, so is the string
+            merged.append(Capacitance(_reciprocal_sum([c.farads for c in capacitors])))
+        return merged
+
+    def _function(self):
+        parts = [e._function() for e in self.elements]
+        return lambda w: sum(part(w) for part in parts)
+
+
+class ParallelNetwork(_Group):
+    """ 1/Z = 1/Z1 + 1/Z2 + ..., 0 when any branch is a short, infinite when no current can flow """
+
+    @staticmethod
+    def _merge(resistors, inductors, capacitors):
+        merged = []
+        if resistors:
+            merged.append(Resistance(_reciprocal_sum([r.ohms for r in resistors])))
+        if inductors:
+            merged.append(Inductance(_reciprocal_sum([coil.henries for coil in inductors])))
+        if capacitors:
+            merged.append(Capacitance(math.fsum(c.farads for c in capacitors)))
+        return merged
+
+    def _function(self):
+        parts = [e._function() for e in self.elements]
+
+        def impedance(w):
+            short = np.zeros(w.shape, dtype=bool)
+            admittance = np.zeros(w.shape, dtype=complex)
+            for part in parts:
+                z = part(w)
+                zero, infinite = z == 0, np.isinf(z)
+                short |= zero
+                # shorted and open branches add no finite admittance, the short is applied below
+                admittance += np.where(zero | infinite, 0, 1 / np.where(zero | infinite, 1, z))
+            open_ = admittance == 0
+            z = 1 / np.where(open_, 1, admittance)
+            return np.where(short, 0j, np.where(open_, complex(math.inf, 0), z))
+        return impedance
+
+
+def series(*elements: Element) -> SeriesNetwork:
+    return SeriesNetwork(*elements)
+
+
+def parallel(*elements: Element) -> ParallelNetwork:
+    return ParallelNetwork(*elements)
+
+
+class CompiledNetwork:
+    """ A network reduced once to a tree of NumPy functions of w, call it with an array of frequencies
+    - shorts (0Ω, 0H) and DC (0Hz, where an inductor is a short and a capacitor is open) are exact, a parallel
+      network with a shorted branch is 0Ω and one no current can flow through is infinite
+    Examples:
+        >>> rc = Resistance(2.2e3) + Capacitance(.022e-6)
+        >>> r = rc.compile()([1.5e3])
+        >>> round(r.magnitude[0], 1), round(r.phase_angle[0], 2)
+        (5301.0, 65.48)
+        >>> tank = Inductance(10e-3) | Capacitance(1e-6)
+        >>> (Resistance(47) + tank + Resistance(53)).compile().reduced
+        SeriesNetwork(R(100.0Ω), ParallelNetwork(L(1.000000e-02H), C(1.000000e-06F)))
+        >>> parallel(Resistance(100), Resistance(100)).impedance([60, 1e3]).magnitude.tolist()
+        [50.0, 50.0]
+
+        A shorted branch, and an L-C tank at DC (the inductor shorts it) and at resonance (open)
+        >>> (Resistance(100) | Resistance(0) | Capacitance(1e-6)).impedance([0, 1e3]).magnitude.tolist()
+        [0.0, 0.0]
+        >>> tank.impedance([0, 1 / (2 * math.pi * math.sqrt(10e-3 * 1e-6))]).magnitude.tolist()
+        [0.0, inf]
+        >>> dc = (Resistance(1e3) + Capacitance(1e-6)).impedance([0])
+        >>> dc.magnitude.tolist(), abs(dc.current(10)).tolist()
+        ([inf], [0.0])
+    """
+
+    def __init__(self, network: Element):
+        self.network = network
+        self.reduced = network._reduced()
+        self._evaluate = self.reduced._function()
+
+    def __call__(self, frequencies) -> 'Response':
+        frequency = np.asarray(frequencies, dtype=float)
+        w = 2 * math.pi * frequency
+        return Response(frequency, np.broadcast_to(self._evaluate(w), w.shape))
+
+    def __repr__(self):
+        return f'Z(jw) of {self.reduced!r}'
+
+
+class Response:
+    """ Complex impedance at each frequency, magnitude and phase_angle match ImpedanceTriangle.z and phase_angle
+    - phase_angle is the angle by which current leads the source voltage, positive for capacitive circuits
+      like ImpedanceTriangle.phase_angle, negative for inductive ones
+    """
+
+    def __init__(self, frequency: np.ndarray, z: np.ndarray):
+        self.frequency = frequency
+        self.z = z
+
+    @property
+    def resistance(self) -> np.ndarray:
+        return self.z.real
+
+    @property
+    def reactance(self) -> np.ndarray:
+        return self.z.imag
+
+    @property
+    def magnitude(self) -> np.ndarray:
+        return np.abs(self.z)
+
+    @property
+    def phase_angle(self) -> np.ndarray:
+        return -np.degrees(np.angle(self.z))
+
+    def current(self, volts: [int | float]) -> np.ndarray:
+        """ complex current for a source of volts at zero phase """
+        return volts / self.z
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self.frequency):,} frequencies, ' \
+               f'|Z| {self.magnitude.min():,.2f}..{self.magnitude.max():,.2f}{OMEGA_SYMBOL})'
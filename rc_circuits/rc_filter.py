@@ -0,0 +1,154 @@
+# rc_circuits/rc_filter.py
+
+"""
+# - Cascaded RC low-pass and high-pass filters, many candidate designs evaluated as one batch
+# - the response is the loaded one, every stage is a two-port (ABCD) matrix and the product of the chain
+#   includes the source resistance, each stage loading the one before it and the load on the last stage
+# - RCCascade.design picks R and C from an E-series table for a cutoff frequency and a stage count,
+#   measures the true -3dB point of every candidate and ranks them
+
+"""
+import itertools
+import math
+import os
+import sys
+
+import numpy as np
+
+# modules of other chapter directories are read through the electronic_fundamentals package in the project root
+if (_root := os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) not in sys.path:
+    sys.path.append(_root)
+
+KINDS = ('low', 'high')
+HALF_POWER = 1 / math.sqrt(2)
+
+
+class RCCascade:
+    """
+    A batch of cascaded RC filters, one design per row of ohms and farads, stage 1 first
+    - low-pass stages are series R then shunt C, high-pass stages series C then shunt R
+    Examples:
+        Two equal stages load each other, the cutoff is 374Hz, not the 644Hz of two isolated stages
+        >>> f = RCCascade([[1e3, 1e3]], [[159.155e-9, 159.155e-9]])
+        >>> f.cutoff().round().tolist()
+        [374.0]
+        >>> np.abs(RCCascade([1e3], [159.155e-9]).response([1e3])).round(4).tolist()
+        [[0.7071]]
+    """
+
+    def __init__(self, ohms, farads, kind: str = 'low', source_ohms: [int | float] = 0.0,
+                 load_ohms: [int | float] = math.inf):
+        if kind not in KINDS:
+            raise ValueError(f'kind must be one of {KINDS}, got {kind!r}')
+        self.ohms = np.atleast_2d(np.asarray(ohms, dtype=float))
+        self.farads = np.atleast_2d(np.asarray(farads, dtype=float))
+        if self.ohms.shape != self.farads.shape:
+            raise ValueError(f'ohms {self.ohms.shape} and farads {self.farads.shape} need one value per stage')
+        self.kind = kind
+        self.source_ohms = source_ohms
+        self.load_ohms = load_ohms
+
+    @property
+    def stages(self) -> int:
+        return self.ohms.shape[1]
+
+    def __len__(self):
+        return len(self.ohms)
+
+    def __getitem__(self, index) -> 'RCCascade':
+        """ the designs selected by a slice, an index array or a mask, as a new batch """
+        index = np.atleast_1d(np.arange(len(self))[index])
+        return RCCascade(self.ohms[index], self.farads[index], self.kind, self.source_ohms, self.load_ohms)
+
+    def response(self, frequencies) -> np.ndarray:
+        """
+        Complex output / source volts of every design, a (designs, frequencies) array,
+        frequencies is 1-D or already one row per design
+        """
+        jw = 2j * math.pi * np.asarray(frequencies, dtype=float)
+        jw = jw[np.newaxis, :] if jw.ndim == 1 else jw
+        # first row (a, b) of the chain matrix, the source resistance is a series element ahead of stage 1
+        a = np.ones(np.broadcast_shapes(jw.shape, (len(self), 1)), dtype=complex)
+        b = np.full(a.shape, complex(self.source_ohms))
+        for k in range(self.stages):
+            r, c = self.ohms[:, k:k + 1], self.farads[:, k:k + 1]
+            z, y = (r, jw * c) if self.kind == 'low' else (1 / (jw * c), 1 / r)
+            # (a, b) @ [[1 + zy, z], [y, 1]]
+            a, b = a * (1 + z * y) + b * y, a * z + b
+        return 1 / a if math.isinf(self.load_ohms) else 1 / (a + b / self.load_ohms)
+
+    def corners(self) -> np.ndarray:
+        """ 1 / (2 pi R C) of every stage on its own """
+        return 1 / (2 * math.pi * self.ohms * self.farads)
+
+    def cutoff(self, points: int = 512, span: [int | float] = 100.0, chunk: int = 512) -> np.ndarray:
+        """
+        -3dB frequency of every design relative to its passband gain, nan when there is none,
+        found on a log grid of points spanning the stage corners / span to * span and interpolated in dB
+        - chunk designs are evaluated at a time to bound memory
+        """
+        result = np.empty(len(self))
+        relative = np.geomspace(1 / span, span, points)
+        for first in range(0, len(self), chunk):
+            part = self[first:first + chunk]
+            center = np.exp(np.log(part.corners()).mean(axis=1))[:, np.newaxis]
+            grid = center * relative
+            passband = np.abs(part.response(center * (1e-6 if self.kind == 'low' else 1e6)))
+            gain = 20 * np.log10(np.abs(part.response(grid)) / passband)
+            if self.kind == 'high':
+                grid, gain = grid[:, ::-1], gain[:, ::-1]
+            # first point past the half power point walking away from the passband
+            past = gain < 20 * math.log10(HALF_POWER)
+            k = past.argmax(axis=1)
+            found = past[np.arange(len(k)), k] & (k > 0)
+            k = np.maximum(k, 1)
+            rows = np.arange(len(k))
+            g0, g1 = gain[rows, k - 1], gain[rows, k]
+            f0, f1 = np.log(grid[rows, k - 1]), np.log(grid[rows, k])
+            with np.errstate(invalid='ignore', divide='ignore'):
+                log_f = f0 + (20 * math.log10(HALF_POWER) - g0) * (f1 - f0) / (g1 - g0)
+            result[first:first + chunk] = np.where(found, np.exp(log_f), np.nan)
+        return result
+
+    @classmethod
+    def design(cls, cutoff: [int | float], stages: int = 2, kind: str = 'low', series: str = 'E24',
+               ratios=(1, 2, 5, 10), ohms=(1e3, 100e3), source_ohms: [int | float] = 0.0,
+               load_ohms: [int | float] = math.inf, top: [int | None] = 10) -> 'RCCascade':
+        """
+        Candidate designs for a -3dB cutoff, ranked by how close their loaded cutoff lands, best first
+        - stage 1 R is every standard value from ohms[0] to ohms[1], stage k R is the standard value nearest
+          R1 * ratio ** k for every ratio, a higher ratio loads the stage before less
+        - each C is the standard value either side of the one that puts an isolated stage at the corner a
+          chain of identical stages would need, every combination is tried
+        Examples:
+            >>> best = RCCascade.design(1e3, stages=2)
+            >>> best.ohms[0].tolist(), best.farads[0].tolist(), round(float(best.cutoff()[0]))
+            ([2200.0, 22000.0], [4.3e-08, 4.3e-09], 1011)
+        """
+        from electronic_fundamentals import eseries
+
+        if kind not in KINDS:
+            raise ValueError(f'kind must be one of {KINDS}, got {kind!r}')
+        resistors = eseries.ESeriesIndex(series, decades=range(0, 8))
+        capacitors = eseries.ESeriesIndex(series, decades=range(-12, -2))
+        first = resistors.values[(resistors.values >= ohms[0]) & (resistors.values <= ohms[1])]
+        scale = np.asarray(ratios, dtype=float)[:, np.newaxis] ** np.arange(stages)
+        r = np.unique(resistors.nearest_many(first[:, np.newaxis, np.newaxis] * scale).reshape(-1, stages), axis=0)
+        # corner of each of n identical isolated stages whose product is 3dB down at cutoff
+        spread = math.sqrt(2 ** (1 / stages) - 1)
+        corner = cutoff / spread if kind == 'low' else cutoff * spread
+        ideal = 1 / (2 * math.pi * corner * r)
+        pos = np.searchsorted(capacitors.values, ideal)
+        below = capacitors.values[np.clip(pos - 1, 0, len(capacitors.values) - 1)]
+        above = capacitors.values[np.clip(pos, 0, len(capacitors.values) - 1)]
+        choice = np.array(list(itertools.product((False, True), repeat=stages)))
+        c = np.where(choice, above[:, np.newaxis], below[:, np.newaxis]).reshape(-1, stages)
+        # equal R and C can come out of different ratios or of both neighbours when C is a standard value
+        parts = np.unique(np.hstack([np.repeat(r, len(choice), axis=0), c]), axis=0)
+        candidates = cls(parts[:, :stages], parts[:, stages:], kind, source_ohms, load_ohms)
+        error = np.abs(np.log(candidates.cutoff() / cutoff))
+        order = np.argsort(np.nan_to_num(error, nan=np.inf), kind='stable')
+        return candidates[order[:top]]
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self):,} designs, {self.stages} {self.kind}-pass stages)'
@@ -0,0 +1,247 @@
+# sensitivity.py
+
+"""
+# - Partial derivatives of circuit results with respect to every part value, in one evaluation
+# - forward mode automatic differentiation, every input is a Dual carrying its value and the gradient
+#   of itself with respect to all the inputs, the circuit formulas run on Duals unchanged
+# - worst case extremes put every part at the end of its tolerance band that moves the result the same way,
+#   the direction read from the sign of its partial derivative
+
+"""
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from electronic_fundamentals import impedance, resistor
+
+
+class Dual:
+    """
+    A value and its gradient with respect to the inputs of a calculation
+    Examples:
+        >>> x, y = variables([3.0, 4.0])
+        >>> r = sqrt(x * x + y * y)
+        >>> r.value, r.gradient.round(12).tolist()
+        (5.0, [0.6, 0.8])
+    """
+    __slots__ = ('value', 'gradient')
+
+    def __init__(self, value: float, gradient: np.ndarray):
+        self.value = value
+        self.gradient = gradient
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, self.gradient + other.gradient)
+        return Dual(self.value + other, self.gradient)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return Dual(-self.value, -self.gradient)
+
+    def __sub__(self, other):
+        return self + -other
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value * other.value, self.gradient * other.value + other.gradient * self.value)
+        return Dual(self.value * other, self.gradient * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            return self * other.reciprocal()
+        return Dual(self.value / other, self.gradient / other)
+
+    def __rtruediv__(self, other):
+        return self.reciprocal() * other
+
+    def reciprocal(self):
+        return Dual(1 / self.value, self.gradient * (-1 / (self.value * self.value)))
+
+    def __pow__(self, exponent: [int | float]):
+        return Dual(self.value ** exponent, self.gradient * (exponent * self.value ** (exponent - 1)))
+
+    def __repr__(self):
+        return f'Dual({self.value!r}, {self.gradient.tolist()!r})'
+
+
+def variables(values) -> list[Dual]:
+    """ one Dual per input, the gradient of input k is 1 at k and 0 elsewhere """
+    values = [float(v) for v in values]
+    seeds = np.eye(len(values))
+    return [Dual(v, seeds[k]) for k, v in enumerate(values)]
+
+
+def sqrt(x):
+    if isinstance(x, Dual):
+        root = math.sqrt(x.value)
+        return Dual(root, x.gradient * (0.5 / root))
+    return math.sqrt(x)
+
+
+def atan(x):
+    if isinstance(x, Dual):
+        return Dual(math.atan(x.value), x.gradient * (1 / (1 + x.value * x.value)))
+    return math.atan(x)
+
+
+def degrees(x):
+    return x * (180 / math.pi) if isinstance(x, Dual) else math.degrees(x)
+
+
+class Partials(NamedTuple):
+    """ a result, its partial derivative with respect to every input, and its worst case extremes """
+    value: float
+    gradient: np.ndarray  # d value / d input, in input order
+    low: float  # nan when no tolerances were given
+    high: float
+
+    def relative(self, values) -> np.ndarray:
+        """ (x / value) * d value / dx, the % change of the result per % change of each input """
+        return self.gradient * np.asarray(values, dtype=float) / self.value
+
+
+def analyze(function, values, tolerances=None) -> list[Partials]:
+    """
+    Runs function(inputs) once on Duals for the value and gradient of each result it returns (one or a tuple),
+    then twice per result with every input at the tolerance limit given by the sign of its partial
+    - tolerances is one fraction per input, or one for all
+    Examples:
+        >>> (rt,) = analyze(lambda x: (x[0] + x[1],), [100, 200], tolerances=0.05)
+        >>> rt.value, rt.gradient.tolist(), rt.low, rt.high
+        (300.0, [1.0, 1.0], 285.0, 315.0)
+    """
+    results = function(variables(values))
+    results = results if isinstance(results, tuple) else (results,)
+    values = np.asarray(values, dtype=float)
+    partials = []
+    for k, result in enumerate(results):
+        low = high = math.nan
+        if tolerances is not None:
+            step = np.sign(result.gradient) * np.asarray(tolerances, dtype=float) * values
+            high = _output(function(list(values + step)), k)
+            low = _output(function(list(values - step)), k)
+        partials.append(Partials(result.value, result.gradient, low, high))
+    return partials
+
+
+def _output(results, k):
+    return float(results[k] if isinstance(results, tuple) else results)
+
+
+class SeriesPartials(NamedTuple):
+    """ inputs are the resistors in circuit order """
+    rt: Partials
+    it: Partials
+    drops: list[Partials]
+
+
+class ParallelPartials(NamedTuple):
+    """ inputs are the resistors in circuit order """
+    rt: Partials
+    it: Partials
+
+
+class TrianglePartials(NamedTuple):
+    """ inputs are (resistor, farads, frequency), or (resistor, xc) when the triangle was given xc """
+    inputs: tuple
+    xc: Partials
+    z: Partials
+    phase_angle: Partials
+
+
+def series(circuit: 'resistor.Series', worst_case: bool = True) -> SeriesPartials:
+    """
+    dRt/dRi, dIt/dRi and dVi/dRj of a Series, worst case extremes from each resistor's tolerance
+    Examples:
+        >>> r1 = resistor.Resistor(100, name='R1', tolerance=0.01)
+        >>> r2 = resistor.Resistor(300, name='R2', tolerance=0.05)
+        >>> p = series(resistor.Series([r1, r2], 12, name='S1'))
+        >>> p.drops[0].value, p.drops[0].gradient.round(6).tolist()
+        (3.0, [0.0225, -0.0075])
+        >>> round(p.drops[0].low, 3), round(p.drops[0].high, 3)
+        (2.87, 3.14)
+    """
+    volts = circuit.volts
+
+    def evaluate(ohms):
+        rt = sum(ohms)
+        return (rt, volts / rt) + tuple(r / rt * volts for r in ohms)
+
+    rt, it, *drops = analyze(evaluate, [r.ohms for r in circuit.resistors], _tolerances(circuit, worst_case))
+    return SeriesPartials(rt, it, drops)
+
+
+def parallel(circuit: 'resistor.Parallel', worst_case: bool = True) -> ParallelPartials:
+    """
+    dRt/dRi and dIt/dRi of a Parallel, worst case extremes from each resistor's tolerance
+    Examples:
+        >>> p = parallel(resistor.Parallel([resistor.Resistor(100), resistor.Resistor(100)], 10))
+        >>> p.rt.value, p.rt.gradient.tolist(), round(p.rt.high, 2)
+        (50.0, [0.25, 0.25], 52.5)
+    """
+    volts = circuit.volts
+
+    def evaluate(ohms):
+        rt = 1 / sum(1 / r for r in ohms)
+        return rt, volts / rt
+
+    return ParallelPartials(*analyze(evaluate, [r.ohms for r in circuit.resistors], _tolerances(circuit, worst_case)))
+
+
+def _tolerances(circuit, worst_case):
+    return [r.tolerance for r in circuit.resistors] if worst_case else None
+
+
+def triangle(t: 'impedance.ImpedanceTriangle', tolerances=None) -> TrianglePartials:
+    """
+    dXc, dZ and dθ (degrees) with respect to R, C and f of an ImpedanceTriangle, or to R and Xc when it was
+    given xc directly, tolerances one per input for worst case extremes
+    Examples:
+        >>> t = impedance.ImpedanceTriangle(resistor=2.2e3, name='t')
+        >>> round(t.calculate_xc(frequency=1.5e3, farads=.022e-6), 1)
+        4822.9
+        >>> p = triangle(t, tolerances=(0.05, 0.1, 0.0))
+        >>> p.inputs, round(p.z.value, 1), round(p.phase_angle.gradient[2], 5)
+        (('resistor', 'farads', 'frequency'), 5301.0, -0.01442)
+        >>> round(p.z.low, 1), round(p.z.high, 1)
+        (4857.1, 5835.4)
+    """
+    if t.farads and t.frequency:
+        inputs, values = ('resistor', 'farads', 'frequency'), [t.resistor, t.farads, t.frequency]
+    else:
+        inputs, values = ('resistor', 'xc'), [t.resistor, t.xc]
+
+    def evaluate(x):
+        xc = 1 / (2 * math.pi * x[2] * x[1]) if len(x) == 3 else x[1]
+        return xc, sqrt(x[0] * x[0] + xc * xc), degrees(atan(xc / x[0]))
+
+    return TrianglePartials(inputs, *analyze(evaluate, values, tolerances))
+
+
+def ladder(series_ohms, shunt_ohms, tolerance=0.05, load=None) -> Partials:
+    """
+    Input resistance of a ladder (series_ohms[k] then shunt_ohms[k] to ground per rung) with its partials,
+    inputs are the series resistors then the shunt resistors
+    Examples:
+        >>> p = ladder([1, 1], [1, 1], tolerance=None)
+        >>> round(p.value, 4), p.gradient.round(4).tolist()
+        (1.6667, [1.0, 0.1111, 0.4444, 0.1111])
+    """
+    n = len(series_ohms)
+
+    def evaluate(x):
+        end = load
+        for r, shunt in zip(reversed(x[:n]), reversed(x[n:])):
+            end = r + (shunt if end is None else shunt * end / (shunt + end))
+        return end
+
+    (result,) = analyze(evaluate, list(series_ohms) + list(shunt_ohms), tolerance)
+    return result